@@ -9,8 +9,15 @@ Features:
 - Security: sandboxing, secrets sanitization, cross-platform file locking
 """
 
-__version__ = "3.3.0"
-
-from .server import main
+from ._version import __version__
 
 __all__ = ["__version__", "main"]
+
+
+def __getattr__(name: str):
+    # Import the server (FastMCP, Gemini client, every tool) only when main is
+    # requested, so importing app.core/app.services/app.tools stays cheap
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
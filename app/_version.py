@@ -0,0 +1,3 @@
+"""Single source of truth for the gemini-mcp-pro version."""
+
+__version__ = "3.3.0"
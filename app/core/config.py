@@ -5,7 +5,10 @@ Centralizes all environment variables and settings.
 
 import os
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import cached_property
+from typing import FrozenSet, List, Optional
+
+from .._version import __version__
 
 
 @dataclass
@@ -17,7 +20,7 @@ class Config:
     """
 
     # Version
-    version: str = "3.3.0"
+    version: str = __version__
 
     # API Configuration
     api_key: str = field(default_factory=lambda: os.environ.get("GEMINI_API_KEY", ""))
@@ -60,6 +63,20 @@ class Config:
         default_factory=lambda: int(os.environ.get("GEMINI_CONVERSATION_MAX_TURNS", "50"))
     )
 
+    # Response Cache (exact-repeat, deterministic requests only; 0 disables)
+    response_cache_size: int = field(
+        default_factory=lambda: int(os.environ.get("GEMINI_RESPONSE_CACHE_SIZE", "256"))
+    )
+    response_cache_ttl_seconds: int = field(
+        default_factory=lambda: int(os.environ.get("GEMINI_RESPONSE_CACHE_TTL", "600"))
+    )
+
+    # SQLite durability for conversation history: NORMAL (default, safe with
+    # WAL; a power loss may drop the last commits) or FULL (fsync every commit)
+    sqlite_synchronous: str = field(
+        default_factory=lambda: os.environ.get("GEMINI_SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    )
+
     # Security - Sandboxing
     sandbox_root: str = field(
         default_factory=lambda: os.environ.get("GEMINI_SANDBOX_ROOT", os.getcwd())
@@ -98,6 +115,11 @@ class Config:
     # Limits
     mcp_prompt_size_limit: int = 60_000  # characters
 
+    @cached_property
+    def disabled_tools_set(self) -> FrozenSet[str]:
+        """Disabled tool names as a frozenset for O(1) membership checks."""
+        return frozenset(self.disabled_tools)
+
     @property
     def conversation_cleanup_interval(self) -> int:
         """Calculate cleanup interval based on TTL."""
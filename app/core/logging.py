@@ -6,27 +6,75 @@ Supports both text and JSON formats for container observability.
 import os
 import sys
 import json
+import time
+import queue
+import atexit
+import hashlib
 import logging
-from datetime import datetime
-from dataclasses import dataclass, asdict
 from typing import Dict, Any, Optional
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Optional fast JSON encoder - falls back to stdlib json if orjson not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from .config import config
 from .security import secrets_sanitizer
 
 
-@dataclass
-class LogRecord:
-    """Structured log record for JSON logging."""
-    timestamp: str
-    level: str
-    tool: Optional[str]
-    status: str
-    duration_ms: Optional[float]
-    request_id: Optional[str]
-    details: Dict[str, Any]
-    error: Optional[str]
+def _json_dumps(obj: Any) -> str:
+    """
+    Serialize a log record, using orjson when available.
+
+    orjson output is compact and keeps non-ASCII characters as UTF-8; the
+    stdlib fallback keeps the original ``json.dumps`` format byte for byte.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+# Log values repeat heavily (arg key lists, result lengths, fixed error strings),
+# so memoize sanitization of short values. The cache is keyed on a digest of the
+# value and holds only the sanitized output, so raw secrets are never retained.
+# Long values are rarely repeated and would only bloat the cache, so they bypass it.
+_SANITIZE_CACHE_MAX_LEN = 512
+_SANITIZE_CACHE_SIZE = 4096
+_sanitize_cache: Dict[bytes, str] = {}
+
+
+def _sanitize(text: str) -> str:
+    """Sanitize a log value, reusing cached results for short strings."""
+    if len(text) > _SANITIZE_CACHE_MAX_LEN:
+        return secrets_sanitizer.sanitize(text)
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    cached = _sanitize_cache.get(key)
+    if cached is None:
+        cached = secrets_sanitizer.sanitize(text)
+        if len(_sanitize_cache) >= _SANITIZE_CACHE_SIZE:
+            _sanitize_cache.clear()
+        _sanitize_cache[key] = cached
+    return cached
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") - rebuilt at most once per second.
+# Stored as one tuple so concurrent readers never see a mismatched pair.
+_ts_cache = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as ISO 8601 with millisecond precision."""
+    global _ts_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{int((now - sec) * 1000):03d}Z"
 
 
 class StructuredLogger:
@@ -46,94 +94,55 @@ class StructuredLogger:
     def __init__(self, name: str = "gemini-mcp"):
         self.name = name
 
-    def _emit(self, record: LogRecord):
+    def _emit(self, level: str, tool: Optional[str], status: str,
+              duration_ms: Optional[float], request_id: Optional[str],
+              details: Dict[str, Any], error: Optional[str]):
         """Output log record as JSON to stderr."""
+        output = {"timestamp": _utc_timestamp(), "level": level}
+
+        # Omit None values for cleaner output
+        if tool is not None:
+            output["tool"] = tool
+        output["status"] = status
+        if duration_ms is not None:
+            output["duration_ms"] = duration_ms
+        if request_id is not None:
+            output["request_id"] = request_id
+
         # Sanitize sensitive data in details
-        safe_details = {}
-        for k, v in record.details.items():
-            str_val = str(v) if not isinstance(v, str) else v
-            safe_details[k] = secrets_sanitizer.sanitize(str_val)
-
-        output = {
-            "timestamp": record.timestamp,
-            "level": record.level,
-            "tool": record.tool,
-            "status": record.status,
-            "duration_ms": record.duration_ms,
-            "request_id": record.request_id,
-            "details": safe_details,
-            "error": secrets_sanitizer.sanitize(record.error) if record.error else None
+        output["details"] = {
+            k: _sanitize(v if isinstance(v, str) else str(v))
+            for k, v in details.items()
         }
 
-        # Remove None values for cleaner output
-        output = {k: v for k, v in output.items() if v is not None}
+        if error:
+            output["error"] = _sanitize(error)
 
-        print(json.dumps(output), file=sys.stderr, flush=True)
+        print(_json_dumps(output), file=sys.stderr, flush=True)
 
     def tool_start(self, tool: str, request_id: str, args: Dict):
         """Log tool execution start."""
-        self._emit(LogRecord(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            level="INFO",
-            tool=tool,
-            status="start",
-            duration_ms=None,
-            request_id=request_id,
-            details={"args_keys": list(args.keys())},
-            error=None
-        ))
+        self._emit("INFO", tool, "start", None, request_id,
+                   {"args_keys": list(args.keys())}, None)
 
     def tool_success(self, tool: str, request_id: str, duration_ms: float, result_len: int):
         """Log tool execution success."""
-        self._emit(LogRecord(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            level="INFO",
-            tool=tool,
-            status="success",
-            duration_ms=round(duration_ms, 2),
-            request_id=request_id,
-            details={"result_length": result_len},
-            error=None
-        ))
+        self._emit("INFO", tool, "success", round(duration_ms, 2), request_id,
+                   {"result_length": result_len}, None)
 
     def tool_error(self, tool: str, request_id: str, duration_ms: float, error: str):
         """Log tool execution error."""
-        self._emit(LogRecord(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            level="ERROR",
-            tool=tool,
-            status="error",
-            duration_ms=round(duration_ms, 2),
-            request_id=request_id,
-            details={},
-            error=error
-        ))
+        self._emit("ERROR", tool, "error", round(duration_ms, 2), request_id, {}, error)
 
     def info(self, message: str, **kwargs):
         """Log info message."""
-        self._emit(LogRecord(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            level="INFO",
-            tool=kwargs.get("tool"),
-            status=kwargs.get("status", "info"),
-            duration_ms=None,
-            request_id=kwargs.get("request_id"),
-            details={"message": message},
-            error=None
-        ))
+        self._emit("INFO", kwargs.get("tool"), kwargs.get("status", "info"), None,
+                   kwargs.get("request_id"), {"message": message}, None)
 
     def error(self, message: str, **kwargs):
         """Log error message."""
-        self._emit(LogRecord(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            level="ERROR",
-            tool=kwargs.get("tool"),
-            status=kwargs.get("status", "error"),
-            duration_ms=None,
-            request_id=kwargs.get("request_id"),
-            details={},
-            error=message
-        ))
+        self._emit("ERROR", kwargs.get("tool"), kwargs.get("status", "error"), None,
+                   kwargs.get("request_id"), {}, message)
 
 
 # Global structured logger instance
@@ -145,10 +154,16 @@ structured_logger = StructuredLogger()
 # =============================================================================
 
 activity_logger = None
+_activity_listener = None
 
 def _init_activity_logger():
-    """Initialize the activity file logger."""
-    global activity_logger
+    """
+    Initialize the activity file logger.
+
+    Records go through a QueueHandler; a QueueListener thread does the actual
+    file write and rollover, so tool calls never block on disk I/O.
+    """
+    global activity_logger, _activity_listener
 
     if not config.activity_log_enabled:
         return
@@ -170,7 +185,13 @@ def _init_activity_logger():
             '%(asctime)s | %(levelname)s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         ))
-        activity_logger.addHandler(handler)
+
+        log_queue = queue.SimpleQueue()
+        activity_logger.addHandler(QueueHandler(log_queue))
+        _activity_listener = QueueListener(log_queue, handler)
+        _activity_listener.start()
+        # Drain pending records on interpreter exit
+        atexit.register(_activity_listener.stop)
     except Exception:
         activity_logger = None
 
@@ -229,10 +250,10 @@ def log_activity(tool_name: str, status: str, duration_ms: float = 0,
                     safe_details[k] = f"[{len(v)} items]"
                 else:
                     safe_details[k] = v
-            parts.append(f"details={json.dumps(safe_details)}")
+            parts.append(f"details={_json_dumps(safe_details)}")
 
         if error:
-            safe_error = secrets_sanitizer.sanitize(error[:200])
+            safe_error = _sanitize(error[:200])
             parts.append(f"error={safe_error}")
 
         activity_logger.info(" | ".join(parts))
@@ -4,16 +4,18 @@ Security utilities: path validation, secrets sanitization, safe file writing.
 
 import os
 import re
+import time
 import shutil
 import hashlib
 import tempfile
 import signal
 import stat
+import threading
 from pathlib import Path
-from datetime import datetime
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
-from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Tuple
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 
 # File locking - cross-platform using filelock
 try:
@@ -28,6 +30,13 @@ except ImportError:
     except ImportError:
         HAS_FCNTL = False
 
+# Optional linear-time regex engine for secrets sanitization
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
 from .config import config
 
 
@@ -35,6 +44,10 @@ from .config import config
 # FILE LOCKING (Race condition prevention)
 # =============================================================================
 
+# fcntl fallback retry delays (seconds): start at 1ms, double up to 50ms
+_LOCK_RETRY_MIN_DELAY = 0.001
+_LOCK_RETRY_MAX_DELAY = 0.05
+
 class FileLockError(Exception):
     """Raised when file lock cannot be acquired."""
     pass
@@ -100,21 +113,24 @@ def file_lock(file_path: str, timeout: float = 5.0, exclusive: bool = True):
         # Create lock file
         lock_fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o600)
 
-        # Try to acquire lock with timeout
-        import time
-        start_time = time.time()
+        # Try to acquire lock with timeout, backing off exponentially so short
+        # critical sections are picked up within milliseconds
+        deadline = time.monotonic() + timeout
         lock_type = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        delay = _LOCK_RETRY_MIN_DELAY
 
         while True:
             try:
                 fcntl.flock(lock_fd, lock_type | fcntl.LOCK_NB)
                 break  # Lock acquired
             except (IOError, OSError):
-                if time.time() - start_time > timeout:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     raise FileLockError(
                         f"Could not acquire lock on {file_path} within {timeout}s"
                     )
-                time.sleep(0.1)  # Wait and retry
+                time.sleep(min(delay, remaining))  # Wait and retry
+                delay = min(delay * 2, _LOCK_RETRY_MAX_DELAY)
 
         yield
 
@@ -141,6 +157,17 @@ class RegexTimeoutError(Exception):
     pass
 
 
+def _regex_alarm_handler(signum, frame):
+    raise RegexTimeoutError("Regex execution exceeded timeout")
+
+
+# Install the SIGALRM handler once; regex_timeout() then only arms/disarms the
+# interval timer. Signal handlers can only be set from the main thread.
+_HAS_SIGALRM = hasattr(signal, 'SIGALRM')
+if _HAS_SIGALRM and threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGALRM, _regex_alarm_handler)
+
+
 @contextmanager
 def regex_timeout(seconds: float = 1.0):
     """
@@ -148,22 +175,24 @@ def regex_timeout(seconds: float = 1.0):
 
     Prevents ReDoS attacks by aborting long-running regex operations.
     On Windows/non-Unix platforms, this is a no-op (no timeout enforced).
+
+    SIGALRM is always delivered to the main thread, so the timeout is only
+    enforced there; in worker threads (tool calls run via asyncio.to_thread)
+    this is a no-op and the bounded patterns are the only protection.
     """
-    def timeout_handler(signum, frame):
-        raise RegexTimeoutError(f"Regex execution exceeded {seconds}s timeout")
+    if not _HAS_SIGALRM or threading.current_thread() is not threading.main_thread():
+        yield
+        return
 
-    # Only set alarm on Unix-like systems
-    if hasattr(signal, 'SIGALRM'):
-        old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.setitimer(signal.ITIMER_REAL, seconds)
-        try:
-            yield
-        finally:
-            signal.setitimer(signal.ITIMER_REAL, 0)
-            signal.signal(signal.SIGALRM, old_handler)
-    else:
-        # Windows/non-Unix: no timeout protection
+    # Re-install only if something else replaced our handler
+    if signal.getsignal(signal.SIGALRM) is not _regex_alarm_handler:
+        signal.signal(signal.SIGALRM, _regex_alarm_handler)
+
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
         yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
 
 
 # =============================================================================
@@ -187,6 +216,13 @@ BINARY_SIGNATURES = [
     b'Rar!\x1a\x07', # RAR
 ]
 
+# Signatures bucketed by first byte, so detection is one dict lookup plus a
+# single startswith() against the (usually one) candidate for that byte
+_SIGNATURES_BY_FIRST_BYTE: Dict[int, Tuple[bytes, ...]] = {}
+for _sig in BINARY_SIGNATURES:
+    _SIGNATURES_BY_FIRST_BYTE[_sig[0]] = _SIGNATURES_BY_FIRST_BYTE.get(_sig[0], ()) + (_sig,)
+del _sig
+
 # File extensions that are always binary
 BINARY_EXTENSIONS = {
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tiff', '.tif',
@@ -199,6 +235,15 @@ BINARY_EXTENSIONS = {
     '.ttf', '.otf', '.woff', '.woff2', '.eot',
 }
 
+# Tuple form for a single str.endswith() check (no Path/suffix allocation)
+_BINARY_EXTENSIONS_TUPLE = tuple(BINARY_EXTENSIONS)
+
+# Translation table mapping control bytes (except tab, LF, CR) to 0x01 and
+# everything else to 0x00, so control bytes can be counted with bytes.count()
+_CONTROL_BYTE_TABLE = bytes(
+    1 if (b < 32 and b not in (9, 10, 13)) else 0 for b in range(256)
+)
+
 
 def is_binary_file(file_path: str, check_content: bool = True) -> bool:
     """
@@ -216,10 +261,8 @@ def is_binary_file(file_path: str, check_content: bool = True) -> bool:
     Returns:
         True if file appears to be binary, False if text
     """
-    path = Path(file_path)
-
     # Check extension first (fast path)
-    if path.suffix.lower() in BINARY_EXTENSIONS:
+    if str(file_path).lower().endswith(_BINARY_EXTENSIONS_TUPLE):
         return True
 
     if not check_content:
@@ -227,7 +270,8 @@ def is_binary_file(file_path: str, check_content: bool = True) -> bool:
 
     # Check file content
     try:
-        with open(file_path, 'rb') as f:
+        # Unbuffered: a single 8KB read needs no BufferedReader buffer/copy
+        with open(file_path, 'rb', buffering=0) as f:
             # Read first 8KB for analysis
             chunk = f.read(8192)
 
@@ -235,14 +279,18 @@ def is_binary_file(file_path: str, check_content: bool = True) -> bool:
                 return False  # Empty file is text
 
             # Check for magic byte signatures
-            for sig in BINARY_SIGNATURES:
-                if chunk.startswith(sig):
-                    return True
+            candidates = _SIGNATURES_BY_FIRST_BYTE.get(chunk[0])
+            if candidates and chunk.startswith(candidates):
+                return True
 
             # Check for null bytes (binary indicator)
             if b'\x00' in chunk:
                 return True
 
+            # Pure ASCII is valid UTF-8; checked in C without decoding to str
+            if chunk.isascii():
+                return False
+
             # Check for high ratio of non-printable characters
             # Text files should be mostly printable ASCII or valid UTF-8
             try:
@@ -251,7 +299,7 @@ def is_binary_file(file_path: str, check_content: bool = True) -> bool:
                 return False
             except UnicodeDecodeError:
                 # Not valid UTF-8, check for high non-ASCII ratio
-                non_text = sum(1 for b in chunk if b < 32 and b not in (9, 10, 13))
+                non_text = chunk.translate(_CONTROL_BYTE_TABLE).count(1)
                 if non_text / len(chunk) > 0.1:  # >10% control chars
                     return True
 
@@ -265,6 +313,21 @@ def is_binary_file(file_path: str, check_content: bool = True) -> bool:
 # PATH VALIDATION
 # =============================================================================
 
+@lru_cache(maxsize=8)
+def _realpath_cached(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def _resolve_sandbox_root(sandbox_root: str) -> str:
+    """
+    Resolve the sandbox root with realpath(), memoized per absolute root.
+
+    The root is fixed config, so the per-component lstat walk only needs to
+    happen once; keying on the path keeps it correct if config changes.
+    """
+    return _realpath_cached(os.path.abspath(sandbox_root))
+
+
 def validate_path(file_path: str, allow_outside_sandbox: bool = False) -> str:
     """
     Validate and resolve a file path, ensuring it's within the sandbox.
@@ -298,7 +361,7 @@ def validate_path(file_path: str, allow_outside_sandbox: bool = False) -> str:
         raise ValueError(f"Invalid path: {e}")
 
     # Check if within sandbox
-    sandbox_resolved = os.path.realpath(config.sandbox_root)
+    sandbox_resolved = _resolve_sandbox_root(config.sandbox_root)
     if not resolved_path.startswith(sandbox_resolved + os.sep) and resolved_path != sandbox_resolved:
         # SECURITY: Don't expose full paths in error messages
         raise ValueError("Access denied: path is outside allowed directory")
@@ -328,6 +391,10 @@ def check_file_size(file_path: str, max_size: int = None) -> Optional[Dict[str,
     return None
 
 
+# Flags for secure_read_file; O_NOFOLLOW/O_CLOEXEC are absent on Windows
+_SECURE_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+
 def secure_read_file(
     file_path: str,
     max_size: int = None,
@@ -338,6 +405,7 @@ def secure_read_file(
 
     SECURITY:
     - Uses fstat() on open file descriptor to prevent TOCTOU race conditions
+    - Opens with O_NOFOLLOW so a symlink swapped in after validation is refused
     - Rejects binary files by default to prevent crashes and garbled output
     - The file size is checked AFTER opening, making it atomic
 
@@ -363,7 +431,10 @@ def secure_read_file(
         )
 
     try:
-        with open(validated_path, 'r', encoding='utf-8') as f:
+        # SECURITY: O_NOFOLLOW makes the kernel refuse a symlink swapped in at
+        # the final component after validate_path() resolved it (path TOCTOU)
+        fd = os.open(validated_path, _SECURE_READ_FLAGS)
+        with os.fdopen(fd, 'r', encoding='utf-8') as f:
             # SECURITY: Check size on open file descriptor (atomic, prevents TOCTOU)
             file_size = os.fstat(f.fileno()).st_size
             if file_size > max_size:
@@ -396,9 +467,12 @@ class SecretsSanitizer:
 
     Security:
     - Regex patterns are designed to avoid catastrophic backtracking (ReDoS)
-    - Timeout protection on Unix platforms for defense in depth
+    - Uses RE2 (linear-time) when google-re2 is installed
+    - Otherwise, timeout protection on Unix platforms for defense in depth
     """
 
+    __slots__ = ('uses_re2', 'compiled_patterns', '_scans', '_scans_by_cost')
+
     # SECURITY: Patterns are designed to be ReDoS-safe
     # - Avoid nested quantifiers like (a+)+
     # - Use possessive quantifiers where possible (simulated via atomic groups)
@@ -412,12 +486,9 @@ class SecretsSanitizer:
         (r'AIza[0-9A-Za-z\-_]{35}', 'GOOGLE_API_KEY'),
         # AWS Access Keys (AKIA format) - exact length
         (r'AKIA[0-9A-Z]{16}', 'AWS_ACCESS_KEY'),
-        # GitHub tokens (specific prefixes) - exact length
-        (r'ghp_[a-zA-Z0-9]{36}', 'GITHUB_PAT'),
-        (r'gho_[a-zA-Z0-9]{36}', 'GITHUB_OAUTH'),
-        (r'ghu_[a-zA-Z0-9]{36}', 'GITHUB_USER_TOKEN'),
-        (r'ghs_[a-zA-Z0-9]{36}', 'GITHUB_SERVER_TOKEN'),
-        (r'ghr_[a-zA-Z0-9]{36}', 'GITHUB_REFRESH_TOKEN'),
+        # GitHub tokens (specific prefixes) - exact length, one pass for all
+        # five types; the prefix letter selects the label (GITHUB_TOKEN_TYPES)
+        (r'gh([pousr])_[a-zA-Z0-9]{36}', 'GITHUB_TOKEN'),
         # Anthropic API keys - bounded length
         (r'sk-ant-[a-zA-Z0-9\-_]{40,100}', 'ANTHROPIC_API_KEY'),
         # OpenAI API keys - exact length
@@ -438,15 +509,103 @@ class SecretsSanitizer:
         (r'(?i)(?:password|passwd|secret)["\s:=]+["\']?([^\s"\']{8,100})["\']?', 'GENERIC_SECRET'),
     ]
 
+    # GitHub token prefix letter -> reported secret type
+    GITHUB_TOKEN_TYPES = {
+        'p': 'GITHUB_PAT',
+        'o': 'GITHUB_OAUTH',
+        'u': 'GITHUB_USER_TOKEN',
+        's': 'GITHUB_SERVER_TOKEN',
+        'r': 'GITHUB_REFRESH_TOKEN',
+    }
+
+    # Literal substrings (casefolded) at least one of which must occur in the
+    # text for the pattern to match. Checked with a plain `in` scan first so
+    # patterns that cannot match are never run - most text has no secrets.
+    PATTERN_ANCHORS = {
+        'JWT_TOKEN': ('eyj',),
+        'PRIVATE_KEY': ('-----begin ',),
+        'GOOGLE_API_KEY': ('aiza',),
+        'AWS_ACCESS_KEY': ('akia',),
+        'GITHUB_TOKEN': ('ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_'),
+        'ANTHROPIC_API_KEY': ('sk-ant-',),
+        'OPENAI_API_KEY': ('sk-',),
+        'SLACK_TOKEN': ('xox',),
+        'BEARER_TOKEN': ('bearer',),
+        'URL_PASSWORD': ('://',),
+        'AWS_SECRET_KEY': ('aws_secret', 'secret_key'),
+        'API_KEY': ('apikey', 'api_key', 'api-key'),
+        'GENERIC_SECRET': ('password', 'passwd', 'secret'),
+    }
+
+    # Above this length the anchor prefilter is skipped when running on RE2
+    RE2_PREFILTER_MAX_LEN = 8192
+
     # Timeout for regex operations (seconds)
     REGEX_TIMEOUT = 0.5
 
+    # Input size cap to prevent DoS (characters)
+    MAX_INPUT_LENGTH = 1_000_000
+
     def __init__(self):
-        """Compile regex patterns for efficiency."""
+        """Compile regex patterns for efficiency (with RE2 when installed)."""
+        # RE2 guarantees linear-time matching, so ReDoS is ruled out and the
+        # SIGALRM timeout is not needed. All patterns are RE2-compatible
+        # (no backreferences or lookarounds; flags are inline (?i)).
+        self.uses_re2 = HAS_RE2
+        engine = re2 if HAS_RE2 else re
         self.compiled_patterns = [
-            (re.compile(pattern), name)
+            (engine.compile(pattern), name)
             for pattern, name in self.PATTERNS
         ]
+        # (pattern, name, replacement, anchors) per pattern. Replacement is a
+        # fixed string, or a callable for merged patterns whose label depends
+        # on the match.
+        self._scans = [
+            (
+                pattern,
+                name,
+                self._redact_github if name == 'GITHUB_TOKEN' else f'[REDACTED_{name}]',
+                self.PATTERN_ANCHORS[name],
+            )
+            for pattern, name in self.compiled_patterns
+        ]
+        # For has_secrets() order does not matter, so try the literal-prefixed
+        # patterns first, then JWT (three {10,500} runs), then the
+        # case-insensitive keyword ones. sanitize()/detect() keep declaration
+        # order: earlier redactions shape what later patterns see (a JWT body
+        # can contain an AIza... run, for example).
+        self._scans_by_cost = sorted(
+            self._scans,
+            key=lambda scan: (scan[0].pattern.startswith('(?i)'), scan[1] == 'JWT_TOKEN'),
+        )
+
+    def _redact_github(self, match) -> str:
+        return f'[REDACTED_{self.GITHUB_TOKEN_TYPES[match.group(1)]}]'
+
+    def _candidates(self, text: str, scans: List[tuple] = None) -> List[tuple]:
+        """Return (pattern, name, replacement) for patterns whose anchors occur in text."""
+        scans = self._scans if scans is None else scans
+        if self.uses_re2 and len(text) > self.RE2_PREFILTER_MAX_LEN:
+            # RE2 scans long text faster than the ~20 substring checks would
+            return [(pattern, name, replacement) for pattern, name, replacement, _ in scans]
+        folded = text.casefold()
+        return [
+            (pattern, name, replacement)
+            for pattern, name, replacement, anchors in scans
+            if any(anchor in folded for anchor in anchors)
+        ]
+
+    def _prepare(self, text: str) -> str:
+        """Cap text at MAX_INPUT_LENGTH; returns it unchanged (no copy) when shorter."""
+        if len(text) > self.MAX_INPUT_LENGTH:
+            return text[:self.MAX_INPUT_LENGTH]
+        return text
+
+    def _time_limit(self):
+        """ReDoS guard for backtracking `re`; a no-op on RE2."""
+        if self.uses_re2:
+            return nullcontext()
+        return regex_timeout(self.REGEX_TIMEOUT)
 
     def sanitize(self, text: str) -> str:
         """
@@ -459,21 +618,19 @@ class SecretsSanitizer:
             Text with secrets replaced by [REDACTED_TYPE]
 
         Note:
-            Uses timeout protection on Unix to prevent ReDoS attacks.
-            On timeout, returns original text (fail-open for availability).
+            Uses timeout protection on Unix to prevent ReDoS attacks
+            (not needed with RE2). On timeout, returns original text (fail-open for availability).
         """
         if not text:
             return text
 
-        # Limit input size to prevent DoS
-        if len(text) > 1_000_000:  # 1MB max
-            text = text[:1_000_000]
+        text = self._prepare(text)
 
         result = text
         try:
-            with regex_timeout(self.REGEX_TIMEOUT):
-                for pattern, name in self.compiled_patterns:
-                    result = pattern.sub(f'[REDACTED_{name}]', result)
+            with self._time_limit():
+                for pattern, _, replacement in self._candidates(text):
+                    result = pattern.sub(replacement, result)
         except RegexTimeoutError:
             # Fail-open: return original text if regex times out
             # This prioritizes availability over perfect sanitization
@@ -483,19 +640,25 @@ class SecretsSanitizer:
     def detect(self, text: str) -> List[str]:
         """
         Return list of detected secret types (without values).
+
+        Each type appears at most once, in PATTERNS declaration order.
         """
         if not text:
             return []
 
-        # Limit input size
-        if len(text) > 1_000_000:
-            text = text[:1_000_000]
+        text = self._prepare(text)
 
         detected = []
         try:
-            with regex_timeout(self.REGEX_TIMEOUT):
-                for pattern, name in self.compiled_patterns:
-                    if pattern.search(text):
+            with self._time_limit():
+                for pattern, name, _ in self._candidates(text):
+                    if name == 'GITHUB_TOKEN':
+                        kinds = {m.group(1) for m in pattern.finditer(text)}
+                        detected.extend(
+                            label for kind, label in self.GITHUB_TOKEN_TYPES.items()
+                            if kind in kinds
+                        )
+                    elif pattern.search(text):
                         detected.append(name)
         except RegexTimeoutError:
             pass
@@ -506,13 +669,11 @@ class SecretsSanitizer:
         if not text:
             return False
 
-        # Limit input size
-        if len(text) > 1_000_000:
-            text = text[:1_000_000]
+        text = self._prepare(text)
 
         try:
-            with regex_timeout(self.REGEX_TIMEOUT):
-                for pattern, _ in self.compiled_patterns:
+            with self._time_limit():
+                for pattern, _, _ in self._candidates(text, self._scans_by_cost):
                     if pattern.search(text):
                         return True
         except RegexTimeoutError:
@@ -528,9 +689,42 @@ secrets_sanitizer = SecretsSanitizer()
 # SAFE FILE WRITER
 # =============================================================================
 
+def _copy_file(src: Path, dst: Path) -> None:
+    """
+    Copy file contents and metadata, like shutil.copy2().
+
+    Uses os.copy_file_range() where available (Linux): the copy stays in the
+    kernel and becomes a reflink on copy-on-write filesystems (Btrfs, XFS).
+    Falls back to shutil.copy2() if the call is unsupported for these files
+    or stops before the whole file is copied.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining <= 0:
+                shutil.copystat(src, dst)
+                return
+            # Stopped short (procfs/FUSE, some cross-filesystem copies): the
+            # portable path below rewrites dst so the copy is never truncated
+        except OSError:
+            pass  # EXDEV/ENOSYS/EINVAL etc. - use the portable path
+    shutil.copy2(src, dst)
+
+
 @dataclass
 class WriteResult:
-    """Result of a safe write operation."""
+    """
+    Result of a safe write operation.
+
+    content_hash is a 64-bit BLAKE2b hex digest of the UTF-8 content - a
+    change-detection tag, not a cryptographic commitment.
+    """
     success: bool
     path: str
     backup_path: Optional[str]
@@ -546,14 +740,14 @@ class SafeFileWriter:
     Features:
     - Automatic backup before overwrite
     - Atomic write (temp file + rename)
-    - Content hash verification
+    - Content hash reported for each write
     - Permission preservation
     - File locking to prevent race conditions (Unix)
 
     Security:
     - Uses fcntl.flock() on Unix for exclusive locking
     - Atomic rename prevents partial writes
-    - Hash verification ensures data integrity
+    - fsync before rename so the new content is durable once visible
     """
 
     BACKUP_DIR = ".gemini_backups"
@@ -571,20 +765,21 @@ class SafeFileWriter:
         1. Validate path is in sandbox
         2. Acquire file lock (Unix only)
         3. Create backup if file exists
-        4. Write to temp file
-        5. Verify content hash
-        6. Atomic rename to target
-        7. Release lock
+        4. Write to temp file and fsync
+        5. Atomic rename to target
+        6. Release lock
         """
         target_path = Path(path)
 
         # Validate sandbox using secure path comparison
-        # SECURITY: Use is_relative_to() instead of string startswith() to prevent
-        # path traversal attacks like /var/data vs /var/database
+        # SECURITY: Compare against the root plus a trailing separator (as in
+        # validate_path) to prevent traversal like /var/data vs /var/database
         try:
-            resolved = target_path.resolve()
-            sandbox_resolved = self.sandbox_root.resolve()
-            if not resolved.is_relative_to(sandbox_resolved):
+            resolved = os.path.realpath(target_path)
+            sandbox_resolved = _resolve_sandbox_root(str(self.sandbox_root))
+            if resolved != sandbox_resolved and not resolved.startswith(
+                os.path.join(sandbox_resolved, '')
+            ):
                 return WriteResult(
                     success=False,
                     path=str(path),
@@ -597,28 +792,32 @@ class SafeFileWriter:
 
         # Use file locking to prevent race conditions
         try:
-            with file_lock(str(resolved), timeout=self.LOCK_TIMEOUT, exclusive=True):
+            with file_lock(resolved, timeout=self.LOCK_TIMEOUT, exclusive=True):
                 return self._write_locked(target_path, content, create_backup)
         except FileLockError as e:
             return WriteResult(False, str(path), None, "", str(e))
 
     def _write_locked(self, target_path: Path, content: str, create_backup: bool) -> WriteResult:
         """Internal write operation, called while holding the lock."""
-        # Preserve permissions if file exists
+        # Preserve permissions if file exists (one stat serves both checks)
         preserved_permissions = None
-        if target_path.exists():
-            try:
-                preserved_permissions = target_path.stat().st_mode
-            except OSError:
-                pass
+        try:
+            preserved_permissions = os.stat(target_path).st_mode
+        except OSError:
+            pass
+        target_exists = preserved_permissions is not None
 
         # Create backup if file exists
         backup_path = None
-        if create_backup and target_path.exists():
+        if create_backup and target_exists:
             backup_path = self._create_backup(target_path)
 
-        # Write to temp file first
-        content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Encode once; the same bytes are hashed and written
+        data = content.encode('utf-8')
+        content_hash = hashlib.blake2b(data, digest_size=8).hexdigest()
+        if os.linesep != '\n':
+            # Match text-mode newline translation (Windows)
+            data = data.replace(b'\n', os.linesep.encode())
 
         try:
             # Create parent directories
@@ -632,13 +831,11 @@ class SafeFileWriter:
             )
 
             try:
-                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                    f.write(content)
-
-                # Verify written content
-                with open(temp_path, 'r', encoding='utf-8') as f:
-                    if hashlib.sha256(f.read().encode()).hexdigest()[:16] != content_hash:
-                        raise IOError("Content verification failed")
+                with os.fdopen(temp_fd, 'wb') as f:
+                    f.write(data)
+                    # Durable before the rename makes it visible
+                    f.flush()
+                    os.fsync(f.fileno())
 
                 # Restore permissions before rename
                 if preserved_permissions is not None:
@@ -673,8 +870,11 @@ class SafeFileWriter:
         if not gitignore_path.exists():
             gitignore_path.write_text("*\n")
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        microseconds = datetime.now().strftime("%f")[:4]
+        # One clock read so the seconds and sub-second parts always agree
+        now_ns = time.time_ns()
+        seconds, remainder_ns = divmod(now_ns, 1_000_000_000)
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(seconds))
+        microseconds = f"{remainder_ns // 1000:06d}"[:4]
 
         try:
             relative_path = path.relative_to(self.sandbox_root)
@@ -688,7 +888,9 @@ class SafeFileWriter:
         backup_subdir.mkdir(parents=True, exist_ok=True)
 
         backup_path = backup_subdir / backup_name
-        shutil.copy2(path, backup_path)
+        # A real copy, not a hardlink: anything that later rewrites the target
+        # in place (a failed write, an external editor) must not change the backup
+        _copy_file(path, backup_path)
 
         # Rotate old backups
         self._rotate_backups(backup_subdir, relative_path.name)
@@ -697,14 +899,22 @@ class SafeFileWriter:
 
     def _rotate_backups(self, backup_dir: Path, filename: str):
         """Keep only MAX_BACKUPS_PER_FILE most recent backups."""
-        backups = sorted(
-            backup_dir.glob(f"{filename}.*.bak"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
+        # Single directory read; equivalent to glob(f"{filename}.*.bak") but
+        # without fnmatch translation, and safe for names containing [*?
+        prefix = f"{filename}."
+        min_len = len(prefix) + len(".bak")
+        with os.scandir(backup_dir) as it:
+            backups = [
+                entry for entry in it
+                if entry.name.startswith(prefix)
+                and entry.name.endswith(".bak")
+                and len(entry.name) >= min_len
+                and entry.is_file(follow_symlinks=False)
+            ]
+        backups.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
 
         for old_backup in backups[self.MAX_BACKUPS_PER_FILE:]:
-            old_backup.unlink()
+            os.unlink(old_backup.path)
 
 
 def secure_write_file(path: str, content: str, create_backup: bool = True) -> WriteResult:
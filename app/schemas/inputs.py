@@ -281,14 +281,7 @@ def validate_tool_input(tool_name: str, args: dict) -> dict:
         return args
 
     try:
-        validated = schema(**args)
-        # Convert to dict, handling enums
-        result = {}
-        for key, value in validated.model_dump().items():
-            if isinstance(value, Enum):
-                result[key] = value.value
-            else:
-                result[key] = value
-        return result
+        # mode="json" emits enum values directly, in one pass in pydantic-core
+        return schema.model_validate(args).model_dump(mode="json")
     except Exception as e:
         raise ValueError(f"Invalid input for {tool_name}: {e}")
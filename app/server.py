@@ -32,6 +32,15 @@ except ImportError:
     print("Error: mcp package not installed. Run: pip install 'mcp[cli]'", file=sys.stderr)
     sys.exit(1)
 
+import anyio
+
+# Optional libuv-based event loop (Linux/macOS) - falls back to stdlib asyncio
+try:
+    import uvloop  # noqa: F401
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 from .core import config, structured_logger
 from .core.security import secure_read_file, validate_path
 
@@ -70,12 +79,23 @@ from .tools.text.challenge import challenge
 from .tools.text.conversations import list_conversations, delete_conversation
 
 
+async def _run_in_thread(func, /, *args, **kwargs):
+    """
+    Run a blocking tool implementation in a worker thread.
+
+    FastMCP awaits async tools but calls sync tools directly on the event loop,
+    so a slow Gemini call would stall the stdio reader and every other request.
+    Offloading keeps the loop free and lets concurrent tool calls overlap.
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
 # =============================================================================
 # TOOL: Codebase Analysis (Gemini's 1M+ token advantage)
 # =============================================================================
 
 @mcp.tool()
-def gemini_analyze_codebase(
+async def gemini_analyze_codebase(
     prompt: str,
     files: List[str],
     analysis_type: str = "general",
@@ -96,7 +116,8 @@ def gemini_analyze_codebase(
     Returns:
         Detailed analysis of the codebase
     """
-    return analyze_codebase(
+    return await _run_in_thread(
+        analyze_codebase,
         prompt=prompt,
         files=files,
         analysis_type=analysis_type,
@@ -110,7 +131,7 @@ def gemini_analyze_codebase(
 # =============================================================================
 
 @mcp.tool()
-def gemini_analyze_image(
+async def gemini_analyze_image(
     image_path: str,
     prompt: str = "Describe this image in detail",
     model: str = "flash"
@@ -127,7 +148,8 @@ def gemini_analyze_image(
     Returns:
         Image analysis response
     """
-    return analyze_image(
+    return await _run_in_thread(
+        analyze_image,
         image_path=image_path,
         prompt=prompt,
         model=model
@@ -139,7 +161,7 @@ def gemini_analyze_image(
 # =============================================================================
 
 @mcp.tool()
-def gemini_web_search(
+async def gemini_web_search(
     query: str,
     model: str = "flash"
 ) -> str:
@@ -154,7 +176,7 @@ def gemini_web_search(
     Returns:
         Search results with source citations
     """
-    return web_search(query=query, model=model)
+    return await _run_in_thread(web_search, query=query, model=model)
 
 
 # =============================================================================
@@ -162,7 +184,7 @@ def gemini_web_search(
 # =============================================================================
 
 @mcp.tool()
-def gemini_deep_research(
+async def gemini_deep_research(
     query: str,
     max_wait_minutes: int = 30,
     continuation_id: Optional[str] = None
@@ -190,7 +212,8 @@ def gemini_deep_research(
     Returns:
         Comprehensive research report with citations
     """
-    return deep_research(
+    return await _run_in_thread(
+        deep_research,
         query=query,
         max_wait_minutes=max_wait_minutes,
         continuation_id=continuation_id
@@ -202,7 +225,7 @@ def gemini_deep_research(
 # =============================================================================
 
 @mcp.tool()
-def gemini_generate_image(
+async def gemini_generate_image(
     prompt: str,
     output_path: Optional[str] = None,
     aspect_ratio: str = "1:1",
@@ -223,7 +246,8 @@ def gemini_generate_image(
     Returns:
         Path to generated image or generation status
     """
-    return generate_image(
+    return await _run_in_thread(
+        generate_image,
         prompt=prompt,
         output_path=output_path,
         aspect_ratio=aspect_ratio,
@@ -237,7 +261,7 @@ def gemini_generate_image(
 # =============================================================================
 
 @mcp.tool()
-def gemini_generate_video(
+async def gemini_generate_video(
     prompt: str,
     output_path: Optional[str] = None,
     duration: int = 8,
@@ -262,7 +286,8 @@ def gemini_generate_video(
     Returns:
         Path to generated video
     """
-    return generate_video(
+    return await _run_in_thread(
+        generate_video,
         prompt=prompt,
         output_path=output_path,
         duration=duration,
@@ -278,7 +303,7 @@ def gemini_generate_video(
 # =============================================================================
 
 @mcp.tool()
-def gemini_text_to_speech(
+async def gemini_text_to_speech(
     text: str,
     voice: str = "Kore",
     output_path: Optional[str] = None,
@@ -299,7 +324,8 @@ def gemini_text_to_speech(
     Returns:
         Path to generated audio file
     """
-    return text_to_speech(
+    return await _run_in_thread(
+        text_to_speech,
         text=text,
         voice=voice,
         output_path=output_path,
@@ -313,7 +339,7 @@ def gemini_text_to_speech(
 # =============================================================================
 
 @mcp.tool()
-def gemini_file_search(
+async def gemini_file_search(
     question: str,
     store_name: str
 ) -> str:
@@ -328,7 +354,7 @@ def gemini_file_search(
     Returns:
         Answer with citations from documents
     """
-    return file_search(question=question, store_name=store_name)
+    return await _run_in_thread(file_search, question=question, store_name=store_name)
 
 
 # =============================================================================
@@ -336,7 +362,7 @@ def gemini_file_search(
 # =============================================================================
 
 @mcp.tool()
-def gemini_create_file_store(name: str) -> str:
+async def gemini_create_file_store(name: str) -> str:
     """
     Create a new File Search Store for RAG queries.
     Use this before uploading files for document search.
@@ -347,11 +373,11 @@ def gemini_create_file_store(name: str) -> str:
     Returns:
         Store creation confirmation with store name
     """
-    return create_file_store(name=name)
+    return await _run_in_thread(create_file_store, name=name)
 
 
 @mcp.tool()
-def gemini_upload_file(file_path: str, store_name: str) -> str:
+async def gemini_upload_file(file_path: str, store_name: str) -> str:
     """
     Upload a file to a File Search Store for RAG queries.
 
@@ -362,18 +388,18 @@ def gemini_upload_file(file_path: str, store_name: str) -> str:
     Returns:
         Upload confirmation
     """
-    return upload_file(file_path=file_path, store_name=store_name)
+    return await _run_in_thread(upload_file, file_path=file_path, store_name=store_name)
 
 
 @mcp.tool()
-def gemini_list_file_stores() -> str:
+async def gemini_list_file_stores() -> str:
     """
     List all available File Search Stores.
 
     Returns:
         List of store names and details
     """
-    return list_file_stores()
+    return await _run_in_thread(list_file_stores)
 
 
 # =============================================================================
@@ -381,7 +407,7 @@ def gemini_list_file_stores() -> str:
 # =============================================================================
 
 @mcp.tool(name="ask_gemini")
-def _ask_gemini(
+async def _ask_gemini(
     prompt: str,
     model: str = "pro",
     temperature: float = 0.5,
@@ -408,7 +434,8 @@ def _ask_gemini(
     Returns:
         Gemini's response with optional thinking process
     """
-    return ask_gemini(
+    return await _run_in_thread(
+        ask_gemini,
         prompt=prompt,
         model=model,
         temperature=temperature,
@@ -425,7 +452,7 @@ def _ask_gemini(
 # =============================================================================
 
 @mcp.tool()
-def gemini_list_conversations(
+async def gemini_list_conversations(
     mode: str = "all",
     search: Optional[str] = None,
     limit: int = 20
@@ -443,7 +470,7 @@ def gemini_list_conversations(
     Returns:
         Formatted table of conversations with IDs
     """
-    return list_conversations(mode=mode, search=search, limit=limit)
+    return await _run_in_thread(list_conversations, mode=mode, search=search, limit=limit)
 
 
 # =============================================================================
@@ -451,7 +478,7 @@ def gemini_list_conversations(
 # =============================================================================
 
 @mcp.tool()
-def gemini_delete_conversation(
+async def gemini_delete_conversation(
     conversation_id: Optional[str] = None,
     title: Optional[str] = None
 ) -> str:
@@ -466,7 +493,7 @@ def gemini_delete_conversation(
     Returns:
         Confirmation message
     """
-    return delete_conversation(conversation_id=conversation_id, title=title)
+    return await _run_in_thread(delete_conversation, conversation_id=conversation_id, title=title)
 
 
 # =============================================================================
@@ -474,7 +501,7 @@ def gemini_delete_conversation(
 # =============================================================================
 
 @mcp.tool()
-def gemini_code_review(
+async def gemini_code_review(
     code: str,
     focus: str = "general",
     model: str = "pro"
@@ -491,7 +518,7 @@ def gemini_code_review(
     Returns:
         Detailed code review with recommendations
     """
-    return code_review(code=code, focus=focus, model=model)
+    return await _run_in_thread(code_review, code=code, focus=focus, model=model)
 
 
 # =============================================================================
@@ -499,7 +526,7 @@ def gemini_code_review(
 # =============================================================================
 
 @mcp.tool()
-def gemini_brainstorm(
+async def gemini_brainstorm(
     topic: str,
     methodology: str = "auto",
     domain: Optional[str] = None,
@@ -524,7 +551,8 @@ def gemini_brainstorm(
     Returns:
         Structured brainstorming output with ideas and analysis
     """
-    return brainstorm(
+    return await _run_in_thread(
+        brainstorm,
         topic=topic,
         methodology=methodology,
         domain=domain,
@@ -540,7 +568,7 @@ def gemini_brainstorm(
 # =============================================================================
 
 @mcp.tool()
-def gemini_challenge(
+async def gemini_challenge(
     statement: str,
     context: str = "",
     focus: str = "general"
@@ -558,7 +586,7 @@ def gemini_challenge(
     Returns:
         Critical analysis with flaws, risks, assumptions, and alternatives
     """
-    return challenge(statement=statement, context=context, focus=focus)
+    return await _run_in_thread(challenge, statement=statement, context=context, focus=focus)
 
 
 # =============================================================================
@@ -566,7 +594,7 @@ def gemini_challenge(
 # =============================================================================
 
 @mcp.tool()
-def gemini_generate_code(
+async def gemini_generate_code(
     prompt: str,
     context_files: Optional[List[str]] = None,
     language: str = "auto",
@@ -589,7 +617,8 @@ def gemini_generate_code(
     Returns:
         Generated code in XML format or save summary if output_dir specified
     """
-    return generate_code(
+    return await _run_in_thread(
+        generate_code,
         prompt=prompt,
         context_files=context_files or [],
         language=language,
@@ -622,6 +651,44 @@ def read_file_resource(path: str) -> str:
 # Entry Point
 # =============================================================================
 
+async def _remove_disabled_tools() -> int:
+    """
+    Unregister tools listed in GEMINI_DISABLED_TOOLS.
+
+    Done once at startup so disabled tools are hidden from tools/list and
+    no per-call check is needed. FastMCP.remove_tool() only exists in newer
+    mcp releases; on older ones disabled tools stay registered (logged).
+
+    Returns:
+        Number of tools removed
+    """
+    registered = {t.name for t in await mcp.list_tools()}
+    to_remove = sorted(config.disabled_tools_set & registered)
+    if not to_remove:
+        return 0
+
+    if not hasattr(mcp, "remove_tool"):
+        structured_logger.error(
+            "GEMINI_DISABLED_TOOLS needs an mcp release with FastMCP.remove_tool(); "
+            f"still enabled: {', '.join(to_remove)}"
+        )
+        return 0
+
+    for name in to_remove:
+        mcp.remove_tool(name)
+    return len(to_remove)
+
+
+async def _serve() -> None:
+    """Apply startup configuration, then serve over stdio."""
+    disabled = await _remove_disabled_tools()
+
+    structured_logger.info(f"Starting gemini-mcp-pro v{config.version}")
+    structured_logger.info(f"Tools available: {len(await mcp.list_tools())} ({disabled} disabled)")
+
+    await mcp.run_stdio_async()
+
+
 def main():
     """Run the MCP server."""
     if not is_available():
@@ -630,11 +697,8 @@ def main():
         print(f"Error: {error}", file=sys.stderr)
         sys.exit(1)
 
-    structured_logger.info(f"Starting gemini-mcp-pro v{config.version}")
-    structured_logger.info(f"Tools available: 18 (including conversation management)")
-
-    # Run the FastMCP server
-    mcp.run()
+    # Run the FastMCP server over stdio (same as mcp.run(), plus uvloop if installed)
+    anyio.run(_serve, backend_options={"use_uvloop": HAS_UVLOOP})
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from .gemini import (
     TTS_MODELS,
     TTS_VOICES,
     generate_with_fallback,
+    response_cache_stats,
     is_available,
     get_error,
 )
@@ -33,6 +34,7 @@ __all__ = [
     "TTS_MODELS",
     "TTS_VOICES",
     "generate_with_fallback",
+    "response_cache_stats",
     "is_available",
     "get_error",
     # Conversation memory (SQLite)
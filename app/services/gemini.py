@@ -5,8 +5,12 @@ This module provides the core Gemini client and model configurations.
 It handles client initialization, model mappings, and API calls with fallback.
 """
 
+import hashlib
 import os
-from typing import Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from ..core import config, log_progress
 
@@ -103,6 +107,104 @@ def get_error() -> Optional[str]:
     return _error
 
 
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL for generate_content responses.
+
+    Only exact repeats of deterministic requests are cached (see
+    _response_cache_key), so agent loops that retry the same prompt skip
+    the API round-trip.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> Any:
+        """Return the cached response for key, or None if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        """Store value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_response_cache = ResponseCache(
+    maxsize=config.response_cache_size,
+    ttl_seconds=config.response_cache_ttl_seconds,
+)
+
+
+def _response_cache_key(model_id: str, contents: Any, gen_config: Any) -> Optional[bytes]:
+    """
+    Return a cache key for a deterministic text request, or None if uncacheable.
+
+    Cacheable means: plain-text contents (no file/image parts), temperature
+    explicitly 0, and no tools (search grounding and File Search results can
+    change between calls).
+    """
+    if _response_cache.maxsize <= 0 or not isinstance(contents, str) or gen_config is None:
+        return None
+    if getattr(gen_config, "temperature", None) != 0 or getattr(gen_config, "tools", None):
+        return None
+    try:
+        config_json = gen_config.model_dump_json(exclude_none=True)
+    except AttributeError:
+        return None
+    digest = hashlib.sha256()
+    for part in (model_id, contents, config_json):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def response_cache_stats() -> Dict[str, int]:
+    """Get response cache counters (hits, misses, evictions, size, maxsize)."""
+    return _response_cache.stats()
+
+
 def generate_with_fallback(
     model_id: str,
     contents: Any,
@@ -112,6 +214,9 @@ def generate_with_fallback(
     """
     Call Gemini API with automatic fallback from Pro to Flash on quota errors.
 
+    Deterministic text requests (temperature 0, no tools) are served from an
+    in-process LRU/TTL cache when the exact same request was made recently.
+
     Args:
         model_id: The model to use (e.g., "gemini-3-pro-preview")
         contents: The content to send to the model
@@ -127,11 +232,32 @@ def generate_with_fallback(
     if not _available:
         raise RuntimeError(_error or "Gemini client not initialized")
 
+    cache_key = _response_cache_key(model_id, contents, config)
+    if cache_key is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            log_progress(f"{operation}: Served from response cache")
+            return cached
+
+    response, used_model = _generate_uncached(model_id, contents, config, operation)
+    # A Flash fallback answer is not cached under the Pro request's key
+    if cache_key is not None and used_model == model_id:
+        _response_cache.put(cache_key, response)
+    return response
+
+
+def _generate_uncached(model_id: str, contents: Any, config: Any, operation: str) -> Tuple[Any, str]:
+    """
+    Single generate_content call with the Pro -> Flash quota fallback.
+
+    Returns:
+        (response, model actually used)
+    """
     try:
         if config:
-            return client.models.generate_content(model=model_id, contents=contents, config=config)
+            return client.models.generate_content(model=model_id, contents=contents, config=config), model_id
         else:
-            return client.models.generate_content(model=model_id, contents=contents)
+            return client.models.generate_content(model=model_id, contents=contents), model_id
     except Exception as e:
         error_msg = str(e).lower()
         # Check for quota/rate limit errors and if we're using a Pro model
@@ -144,7 +270,7 @@ def generate_with_fallback(
                 else:
                     response = client.models.generate_content(model=flash_model, contents=contents)
                 log_progress(f"{operation}: Completed with Flash fallback")
-                return response
+                return response, flash_model
             except Exception as fallback_error:
                 raise Exception(f"Both Pro and Flash failed. Pro error: {str(e)}. Flash error: {str(fallback_error)}")
         raise
@@ -15,20 +15,104 @@ import sqlite3
 import json
 import os
 import stat
+import time
+import uuid
 import threading
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass
 from contextlib import contextmanager
 
-from ..core.config import config
+# Optional fast JSON codec - falls back to stdlib json if orjson not installed
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
+from ..core.config import config
 
 # Restrictive permissions for database file (owner read/write only)
 DB_FILE_PERMISSIONS = stat.S_IRUSR | stat.S_IWUSR  # 0o600
 
 
+# PRAGMA synchronous values accepted from GEMINI_SQLITE_SYNCHRONOUS
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Memory-map up to 256MB of the database file for reads
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Expired threads deleted per transaction by cleanup_expired()
+CLEANUP_BATCH_SIZE = 500
+
+# Conversation index (v3.3.0). seq is an explicit INTEGER PRIMARY KEY so the
+# rowid that conversation_fts points at is stable; VACUUM may renumber the
+# implicit rowid of a table without one.
+CONVERSATION_INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS conversation_index (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        mode TEXT NOT NULL DEFAULT 'local',
+        created_at TEXT NOT NULL,
+        last_used_at TEXT NOT NULL,
+        turn_count INTEGER DEFAULT 0,
+        first_prompt TEXT,
+        FOREIGN KEY (id) REFERENCES conversations(id)
+            ON DELETE CASCADE
+    );
+
+    -- (mode, last_used_at) serves the mode-filtered, most recent
+    -- first listing without a sort; last_used_at alone the rest
+    CREATE INDEX IF NOT EXISTS idx_conversation_index_mode_last_used
+        ON conversation_index(mode, last_used_at DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_conversation_index_last_used
+        ON conversation_index(last_used_at);
+"""
+
+# Trigram full-text index over conversation_index (title, first_prompt).
+# Trigrams match substrings case-insensitively, like the LIKE '%...%' search
+# they replace; needs SQLite 3.34+ built with FTS5.
+CONVERSATION_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE conversation_fts USING fts5(
+        title, first_prompt,
+        content='conversation_index', content_rowid='seq',
+        tokenize='trigram'
+    );
+
+    CREATE TRIGGER conversation_fts_insert AFTER INSERT ON conversation_index BEGIN
+        INSERT INTO conversation_fts(rowid, title, first_prompt)
+            VALUES (new.seq, new.title, new.first_prompt);
+    END;
+
+    CREATE TRIGGER conversation_fts_delete AFTER DELETE ON conversation_index BEGIN
+        INSERT INTO conversation_fts(conversation_fts, rowid, title, first_prompt)
+            VALUES ('delete', old.seq, old.title, old.first_prompt);
+    END;
+
+    CREATE TRIGGER conversation_fts_update
+    AFTER UPDATE OF title, first_prompt ON conversation_index BEGIN
+        INSERT INTO conversation_fts(conversation_fts, rowid, title, first_prompt)
+            VALUES ('delete', old.seq, old.title, old.first_prompt);
+        INSERT INTO conversation_fts(rowid, title, first_prompt)
+            VALUES (new.seq, new.title, new.first_prompt);
+    END;
+
+    INSERT INTO conversation_fts(conversation_fts) VALUES ('rebuild');
+"""
+
+# Trigram queries need at least this many characters; shorter ones use LIKE
+FTS_MIN_QUERY_LENGTH = 3
+
+
+def _utc_now() -> Tuple[float, str]:
+    """Current time as (epoch seconds, naive UTC ISO-8601 string), one clock read."""
+    ts = time.time()
+    return ts, datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
 # Database location
 DB_DIR = Path.home() / ".gemini-mcp-pro"
 DB_PATH = DB_DIR / "conversations.db"
@@ -38,9 +122,26 @@ CONVERSATION_TTL_HOURS = config.conversation_ttl_hours
 CONVERSATION_MAX_TURNS = config.conversation_max_turns
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize metadata/files columns, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse metadata/files columns, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 @dataclass
 class ConversationTurn:
     """A single turn in a conversation."""
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = ('role', 'content', 'timestamp', 'tool_name', 'files')
+
     role: str
     content: str
     timestamp: str
@@ -48,7 +149,14 @@ class ConversationTurn:
     files: List[str]
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Flat fields: a literal is much cheaper than asdict()'s recursive copy
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "tool_name": self.tool_name,
+            "files": list(self.files),
+        }
 
     @classmethod
     def from_row(cls, row: tuple) -> "ConversationTurn":
@@ -57,7 +165,8 @@ class ConversationTurn:
             content=row[1],
             timestamp=row[2],
             tool_name=row[3],
-            files=json.loads(row[4]) if row[4] else []
+            # Most turns reference no files; skip parsing the '[]' sentinel
+            files=_json_loads(row[4]) if row[4] and row[4] != '[]' else []
         )
 
 
@@ -77,13 +186,25 @@ class PersistentConversationMemory:
     ):
         # Handle both Path and str
         self.db_path = Path(db_path) if isinstance(db_path, str) else db_path
-        self.ttl_hours = ttl_hours or int(
-            config.__dict__.get('conversation_ttl_hours', 3)
-        )
-        self.max_turns = max_turns or int(
-            config.__dict__.get('conversation_max_turns', 50)
-        )
+        self.ttl_hours = ttl_hours if ttl_hours is not None else config.conversation_ttl_hours
+        self.max_turns = max_turns if max_turns is not None else config.conversation_max_turns
+        self._ttl_seconds = self.ttl_hours * 3600
         self._lock = threading.Lock()
+        # One connection per thread, opened on first use and reused. Only the
+        # owning thread ever touches it: close() bumps the generation and each
+        # thread closes its stale connection on its next call, while a finished
+        # thread's connection is freed (and closed) with its thread-local.
+        self._local = threading.local()
+        self._generation = 0  # bumped by close() to retire pooled connections
+        self._generation_lock = threading.Lock()
+        synchronous = config.sqlite_synchronous
+        self._synchronous = synchronous if synchronous in SQLITE_SYNCHRONOUS_MODES else "NORMAL"
+        # Expired threads are purged from create_thread() at most once per
+        # interval (same formula as config.conversation_cleanup_interval);
+        # no background thread is needed.
+        self._cleanup_interval = max(300, int(self._ttl_seconds) // 10)
+        self._next_cleanup = 0.0  # time.monotonic() deadline
+        self._has_fts = False  # set by _init_db() if conversation_fts exists
         self._init_db()
 
     def _init_db(self):
@@ -104,7 +225,9 @@ class PersistentConversationMemory:
                     id TEXT PRIMARY KEY,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
-                    metadata TEXT DEFAULT '{}'
+                    metadata TEXT DEFAULT '{}',
+                    turn_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at_ts REAL NOT NULL DEFAULT 0
                 );
 
                 CREATE TABLE IF NOT EXISTS turns (
@@ -125,25 +248,77 @@ class PersistentConversationMemory:
                 CREATE INDEX IF NOT EXISTS idx_conversations_updated
                     ON conversations(updated_at);
 
-                -- Conversation index for v3.3.0
-                CREATE TABLE IF NOT EXISTS conversation_index (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    mode TEXT NOT NULL DEFAULT 'local',
-                    created_at TEXT NOT NULL,
-                    last_used_at TEXT NOT NULL,
-                    turn_count INTEGER DEFAULT 0,
-                    first_prompt TEXT,
-                    FOREIGN KEY (id) REFERENCES conversations(id)
-                        ON DELETE CASCADE
-                );
+                -- Superseded by idx_conversation_index_mode_last_used
+                DROP INDEX IF EXISTS idx_conversation_index_mode;
+            """ + CONVERSATION_INDEX_SCHEMA)
 
-                CREATE INDEX IF NOT EXISTS idx_conversation_index_mode
-                    ON conversation_index(mode);
+            # Migration: databases created before turn_count was denormalized
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(conversations)")}
+            if "turn_count" not in columns:
+                conn.execute(
+                    "ALTER TABLE conversations ADD COLUMN turn_count INTEGER NOT NULL DEFAULT 0"
+                )
+                conn.execute(
+                    """UPDATE conversations SET turn_count =
+                       (SELECT COUNT(*) FROM turns WHERE conversation_id = conversations.id)"""
+                )
 
-                CREATE INDEX IF NOT EXISTS idx_conversation_index_last_used
-                    ON conversation_index(last_used_at);
-            """)
+            # Migration: epoch copy of updated_at for numeric expiry checks
+            if "updated_at_ts" not in columns:
+                conn.execute(
+                    "ALTER TABLE conversations ADD COLUMN updated_at_ts REAL NOT NULL DEFAULT 0"
+                )
+                conn.execute(
+                    """UPDATE conversations
+                       SET updated_at_ts = (julianday(updated_at) - 2440587.5) * 86400.0"""
+                )
+            conn.execute(
+                """CREATE INDEX IF NOT EXISTS idx_conversations_updated_ts
+                   ON conversations(updated_at_ts)"""
+            )
+
+            # Migration: conversation_index keyed on its implicit rowid (before
+            # seq). Rebuilt in place; the search index is dropped with it and
+            # recreated below from the copied rows.
+            index_columns = {row[1] for row in conn.execute("PRAGMA table_info(conversation_index)")}
+            if "seq" not in index_columns:
+                try:
+                    conn.executescript("""
+                        SAVEPOINT index_seq;
+                        DROP TRIGGER IF EXISTS conversation_fts_insert;
+                        DROP TRIGGER IF EXISTS conversation_fts_delete;
+                        DROP TRIGGER IF EXISTS conversation_fts_update;
+                        DROP TABLE IF EXISTS conversation_fts;
+                        ALTER TABLE conversation_index RENAME TO conversation_index_old;
+                        DROP INDEX IF EXISTS idx_conversation_index_mode_last_used;
+                        DROP INDEX IF EXISTS idx_conversation_index_last_used;
+                    """ + CONVERSATION_INDEX_SCHEMA + """
+                        INSERT INTO conversation_index
+                            (id, title, mode, created_at, last_used_at, turn_count, first_prompt)
+                        SELECT id, title, mode, created_at, last_used_at, turn_count, first_prompt
+                        FROM conversation_index_old ORDER BY rowid;
+                        DROP TABLE conversation_index_old;
+                        RELEASE index_seq;
+                    """)
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK TO index_seq")
+                    conn.execute("RELEASE index_seq")
+                    raise
+
+            # Full-text search index; built from existing rows on first run
+            self._has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'conversation_fts'"
+            ).fetchone() is not None
+            if not self._has_fts:
+                try:
+                    conn.executescript(
+                        "SAVEPOINT fts;" + CONVERSATION_FTS_SCHEMA + "RELEASE fts;"
+                    )
+                    self._has_fts = True
+                except sqlite3.OperationalError:
+                    # SQLite without FTS5/trigram: search falls back to LIKE
+                    conn.execute("ROLLBACK TO fts")
+                    conn.execute("RELEASE fts")
 
         # Set restrictive permissions on database file (owner read/write only)
         # This prevents other users from reading conversation history
@@ -160,20 +335,38 @@ class PersistentConversationMemory:
             except OSError:
                 pass  # Best effort - may fail on some filesystems
 
-    @contextmanager
-    def _get_connection(self):
-        """Get a database connection with proper settings."""
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and apply per-connection settings (once)."""
         conn = sqlite3.connect(self.db_path, timeout=30.0)
         conn.execute("PRAGMA foreign_keys = ON")
         conn.execute("PRAGMA journal_mode = WAL")
+        # With WAL, NORMAL only fsyncs at checkpoints instead of every commit
+        conn.execute(f"PRAGMA synchronous = {self._synchronous}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        return conn
+
+    @contextmanager
+    def _get_connection(self):
+        """Get this thread's pooled database connection; commits on success."""
+        conn = getattr(self._local, "conn", None)
+        generation = self._generation
+        if conn is None or self._local.generation != generation:
+            if conn is not None:
+                self._close_local()
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.generation = generation
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
+
+    def _expiry_cutoff(self) -> float:
+        """Epoch seconds before which a thread's updated_at_ts counts as expired."""
+        return time.time() - self._ttl_seconds
 
     def create_thread(self, metadata: Dict[str, Any] = None, thread_id: str = None) -> str:
         """
@@ -186,19 +379,35 @@ class PersistentConversationMemory:
         Returns:
             The thread ID
         """
-        import uuid
+        return self._insert_thread(metadata, thread_id)["id"]
+
+    def _insert_thread(
+        self,
+        metadata: Optional[Dict[str, Any]],
+        thread_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Insert a thread row; returns it as get_thread() would, without re-reading."""
+        self._maybe_cleanup()
+
         thread_id = thread_id or str(uuid.uuid4())
-        now = datetime.utcnow().isoformat()
+        now_ts, now = _utc_now()
+        encoded = _json_dumps(metadata or {})
 
         with self._lock:
             with self._get_connection() as conn:
                 conn.execute(
-                    """INSERT INTO conversations (id, created_at, updated_at, metadata)
-                       VALUES (?, ?, ?, ?)""",
-                    (thread_id, now, now, json.dumps(metadata or {}))
+                    """INSERT INTO conversations
+                       (id, created_at, updated_at, updated_at_ts, metadata)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (thread_id, now, now, now_ts, encoded)
                 )
 
-        return thread_id
+        return {
+            "id": thread_id,
+            "created_at": now,
+            "updated_at": now,
+            "metadata": _json_loads(encoded)  # same JSON round-trip as get_thread()
+        }
 
     def get_thread(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -206,27 +415,23 @@ class PersistentConversationMemory:
 
         Returns None if thread doesn't exist or is expired.
         """
+        # Expired rows are filtered here and deleted by cleanup_expired()
         with self._get_connection() as conn:
             cursor = conn.execute(
-                "SELECT id, created_at, updated_at, metadata FROM conversations WHERE id = ?",
-                (thread_id,)
+                """SELECT id, created_at, updated_at, metadata
+                   FROM conversations WHERE id = ? AND updated_at_ts >= ?""",
+                (thread_id, self._expiry_cutoff())
             )
             row = cursor.fetchone()
 
             if not row:
                 return None
 
-            # Check if expired
-            updated_at = datetime.fromisoformat(row[2])
-            if datetime.utcnow() - updated_at > timedelta(hours=self.ttl_hours):
-                self.delete_thread(thread_id)
-                return None
-
             return {
                 "id": row[0],
                 "created_at": row[1],
                 "updated_at": row[2],
-                "metadata": json.loads(row[3])
+                "metadata": _json_loads(row[3])
             }
 
     def add_turn(
@@ -248,44 +453,67 @@ class PersistentConversationMemory:
             files: Optional list of file paths referenced
 
         Returns:
-            True if successful, False if thread not found or at max turns
+            True if successful, False if thread not found, expired or at max turns
         """
-        now = datetime.utcnow().isoformat()
+        return self.add_turns(thread_id, [(role, content, tool_name, files)]) == 1
+
+    def add_turns(
+        self,
+        thread_id: str,
+        turns: List[Tuple[str, str, Optional[str], Optional[List[str]]]]
+    ) -> int:
+        """
+        Add several turns to a conversation thread in one transaction.
+
+        Prefer this over repeated add_turn() calls when writing more than one
+        message at once: the thread row is updated and committed only once.
+
+        Args:
+            thread_id: The conversation thread ID
+            turns: (role, content, tool_name, files) tuples, oldest first
+
+        Returns:
+            Number of turns added: all of them, or 0 if the thread is not
+            found, expired, or the turns would exceed max turns
+        """
+        if not turns:
+            return 0
+
+        now_ts, now = _utc_now()
+        count = len(turns)
 
         with self._lock:
             with self._get_connection() as conn:
-                # Check thread exists
+                # Claim turn slots: fails if the thread is missing, expired or full
                 cursor = conn.execute(
-                    "SELECT id FROM conversations WHERE id = ?",
-                    (thread_id,)
-                )
-                if not cursor.fetchone():
-                    return False
-
-                # Check turn count
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM turns WHERE conversation_id = ?",
-                    (thread_id,)
+                    """UPDATE conversations
+                       SET turn_count = turn_count + ?, updated_at = ?, updated_at_ts = ?
+                       WHERE id = ? AND updated_at_ts >= ? AND turn_count + ? <= ?""",
+                    (count, now, now_ts, thread_id, self._expiry_cutoff(), count, self.max_turns)
                 )
-                turn_count = cursor.fetchone()[0]
-                if turn_count >= self.max_turns:
-                    return False
+                if cursor.rowcount == 0:
+                    return 0
 
-                # Add turn
-                conn.execute(
+                conn.executemany(
                     """INSERT INTO turns
                        (conversation_id, role, content, timestamp, tool_name, files)
                        VALUES (?, ?, ?, ?, ?, ?)""",
-                    (thread_id, role, content, now, tool_name, json.dumps(files or []))
+                    [
+                        (thread_id, role, content, now, tool_name, _json_dumps(files or []))
+                        for role, content, tool_name, files in turns
+                    ]
                 )
 
-                # Update conversation timestamp
-                conn.execute(
-                    "UPDATE conversations SET updated_at = ? WHERE id = ?",
-                    (now, thread_id)
-                )
+        return count
 
-        return True
+    def get_turn_count(self, thread_id: str) -> int:
+        """Number of turns stored for a thread (0 if it doesn't exist)."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT turn_count FROM conversations WHERE id = ?",
+                (thread_id,)
+            ).fetchone()
+        return row[0] if row else 0
 
     def get_thread_history(self, thread_id: str) -> List[ConversationTurn]:
         """
@@ -293,12 +521,14 @@ class PersistentConversationMemory:
 
         Returns empty list if thread doesn't exist.
         """
+        # ORDER BY id (insertion order) is served by idx_turns_conversation;
+        # ordering by the ISO timestamp text would need a temp B-tree sort.
         with self._get_connection() as conn:
             cursor = conn.execute(
                 """SELECT role, content, timestamp, tool_name, files
                    FROM turns
                    WHERE conversation_id = ?
-                   ORDER BY timestamp""",
+                   ORDER BY id""",
                 (thread_id,)
             )
             return [ConversationTurn.from_row(row) for row in cursor.fetchall()]
@@ -320,23 +550,29 @@ class PersistentConversationMemory:
         Returns:
             Formatted conversation history string
         """
-        turns = self.get_thread_history(thread_id)
-        if not turns:
-            return ""
-
         parts = []
         total_chars = 0
 
-        # Iterate newest to oldest to keep recent context when truncating
-        for turn in reversed(turns):
-            role_prefix = "User" if turn.role == "user" else "Assistant"
-            part = f"[{role_prefix}]: {turn.content}"
+        # Stream newest to oldest to keep recent context when truncating;
+        # rows past the budget are never fetched. turns.id follows insertion
+        # order and rides the conversation_id index, so no sort is needed.
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                """SELECT role, content
+                   FROM turns
+                   WHERE conversation_id = ?
+                   ORDER BY id DESC""",
+                (thread_id,)
+            )
+            for role, content in cursor:
+                role_prefix = "User" if role == "user" else "Assistant"
+                part = f"[{role_prefix}]: {content}"
 
-            if total_chars + len(part) > max_chars:
-                break
+                if total_chars + len(part) > max_chars:
+                    break
 
-            parts.append(part)
-            total_chars += len(part)
+                parts.append(part)
+                total_chars += len(part)
 
         # Reverse back to chronological order for output
         return "\n\n".join(reversed(parts))
@@ -361,10 +597,9 @@ class PersistentConversationMemory:
             if thread:
                 return (continuation_id, False, thread)
 
-        # Create new thread with optional metadata
-        thread_id = self.create_thread(metadata=metadata)
-        thread = self.get_thread(thread_id)
-        return (thread_id, True, thread)
+        # Create new thread with optional metadata (no read-back needed)
+        thread = self._insert_thread(metadata, None)
+        return (thread["id"], True, thread)
 
     def delete_thread(self, thread_id: str) -> bool:
         """Delete a conversation thread and all its turns."""
@@ -383,15 +618,31 @@ class PersistentConversationMemory:
         Returns:
             Number of threads deleted
         """
-        cutoff = (datetime.utcnow() - timedelta(hours=self.ttl_hours)).isoformat()
-
+        cutoff = self._expiry_cutoff()
+        deleted = 0
+
+        # Delete (and commit) in batches so concurrent writers only ever
+        # wait for one batch, not for the whole purge
+        while True:
+            with self._lock:
+                with self._get_connection() as conn:
+                    cursor = conn.execute(
+                        """DELETE FROM conversations WHERE id IN
+                           (SELECT id FROM conversations WHERE updated_at_ts < ? LIMIT ?)""",
+                        (cutoff, CLEANUP_BATCH_SIZE)
+                    )
+            deleted += cursor.rowcount
+            if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                return deleted
+
+    def _maybe_cleanup(self) -> None:
+        """Run cleanup_expired() if the cleanup interval has elapsed."""
+        now = time.monotonic()
         with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "DELETE FROM conversations WHERE updated_at < ?",
-                    (cutoff,)
-                )
-                return cursor.rowcount
+            if now < self._next_cleanup:
+                return
+            self._next_cleanup = now + self._cleanup_interval
+        self.cleanup_expired()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about stored conversations."""
@@ -438,49 +689,39 @@ class PersistentConversationMemory:
         Returns:
             True if successful
         """
-        now = datetime.utcnow().isoformat()
+        _, now = _utc_now()
 
         with self._lock:
             with self._get_connection() as conn:
-                # Get turn count
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM turns WHERE conversation_id = ?",
-                    (thread_id,)
-                )
-                turn_count = cursor.fetchone()[0]
-
-                # Upsert into index
+                # Upsert into index (turn count read from the conversation row)
                 conn.execute(
                     """INSERT INTO conversation_index
                        (id, title, mode, created_at, last_used_at, turn_count, first_prompt)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       VALUES (?, ?, ?, ?, ?,
+                               COALESCE((SELECT turn_count FROM conversations WHERE id = ?), 0),
+                               ?)
                        ON CONFLICT(id) DO UPDATE SET
                            title = excluded.title,
                            last_used_at = excluded.last_used_at,
                            turn_count = excluded.turn_count""",
-                    (thread_id, title, mode, now, now, turn_count, first_prompt)
+                    (thread_id, title, mode, now, now, thread_id, first_prompt)
                 )
 
         return True
 
     def update_index_activity(self, thread_id: str) -> bool:
         """Update last_used_at and turn_count for a conversation."""
-        now = datetime.utcnow().isoformat()
+        _, now = _utc_now()
 
         with self._lock:
             with self._get_connection() as conn:
-                # Get current turn count
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM turns WHERE conversation_id = ?",
-                    (thread_id,)
-                )
-                turn_count = cursor.fetchone()[0]
-
                 cursor = conn.execute(
                     """UPDATE conversation_index
-                       SET last_used_at = ?, turn_count = ?
+                       SET last_used_at = ?,
+                           turn_count = COALESCE(
+                               (SELECT turn_count FROM conversations WHERE id = ?), 0)
                        WHERE id = ?""",
-                    (now, turn_count, thread_id)
+                    (now, thread_id, thread_id)
                 )
                 return cursor.rowcount > 0
 
@@ -513,9 +754,15 @@ class PersistentConversationMemory:
             params.append(mode)
 
         if search:
-            query += " AND (title LIKE ? OR first_prompt LIKE ?)"
-            search_pattern = f"%{search}%"
-            params.extend([search_pattern, search_pattern])
+            match = self._fts_match(search)
+            if match:
+                query += """ AND seq IN
+                    (SELECT rowid FROM conversation_fts WHERE conversation_fts MATCH ?)"""
+                params.append(match)
+            else:
+                query += " AND (title LIKE ? OR first_prompt LIKE ?)"
+                search_pattern = f"%{search}%"
+                params.extend([search_pattern, search_pattern])
 
         query += " ORDER BY last_used_at DESC LIMIT ?"
         params.append(limit)
@@ -549,16 +796,41 @@ class PersistentConversationMemory:
 
             if not row:
                 # Try partial match
-                cursor = conn.execute(
-                    "SELECT id, title, mode FROM conversation_index WHERE title LIKE ? LIMIT 1",
-                    (f"%{title}%",)
-                )
+                match = self._fts_match(title, column="title")
+                if match:
+                    cursor = conn.execute(
+                        """SELECT id, title, mode FROM conversation_index
+                           WHERE seq IN (SELECT rowid FROM conversation_fts
+                                           WHERE conversation_fts MATCH ?)
+                           LIMIT 1""",
+                        (match,)
+                    )
+                else:
+                    cursor = conn.execute(
+                        "SELECT id, title, mode FROM conversation_index WHERE title LIKE ? LIMIT 1",
+                        (f"%{title}%",)
+                    )
                 row = cursor.fetchone()
 
             if row:
                 return {"id": row[0], "title": row[1], "mode": row[2]}
             return None
 
+    def _fts_match(self, text: str, column: str = None) -> Optional[str]:
+        """
+        Build an FTS5 MATCH expression for a substring search.
+
+        The text is quoted as a single phrase, so FTS5 operators and
+        punctuation in user input are matched literally.
+
+        Returns:
+            MATCH expression, or None if the LIKE fallback must be used
+        """
+        if not self._has_fts or len(text) < FTS_MIN_QUERY_LENGTH:
+            return None
+        phrase = '"' + text.replace('"', '""') + '"'
+        return f"{column} : {phrase}" if column else phrase
+
     def delete_from_index(self, thread_id: str) -> bool:
         """Remove a conversation from the index (and delete the conversation)."""
         # This will cascade delete from conversation_index due to FK
@@ -587,11 +859,27 @@ class PersistentConversationMemory:
 
         return title
 
+    def _close_local(self):
+        """Close the calling thread's pooled connection, if it has one."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
     def close(self):
-        """Close the database connection (no-op for SQLite with context manager)."""
-        # SQLite connections are managed via context manager
-        # This method exists for API compatibility
-        pass
+        """
+        Close pooled connections; later calls transparently reconnect.
+
+        The calling thread's connection is closed now. Connections owned by
+        other threads are retired and closed by those threads on their next
+        call, so a query in flight elsewhere is never cut off.
+        """
+        with self._generation_lock:
+            self._generation += 1
+        self._close_local()
 
 
 # Global instance
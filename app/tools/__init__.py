@@ -1,12 +1,27 @@
 """MCP Tools for Gemini integration."""
 
+import importlib
+
 from .registry import ToolRegistry, tool_registry, tool
 
-# Import tool modules to register them
-from . import text
-from . import web
-from . import rag
-from . import media
-from . import code
+# Tool subpackages register their tools on import. They are imported on first
+# attribute access (PEP 562) or when the registry is first queried, so
+# importing app.tools (or one tool module) doesn't load every tool's deps.
+_SUBPACKAGES = ("text", "web", "rag", "media", "code")
+
+
+def load_tools() -> None:
+    """Import all tool subpackages so every tool is registered."""
+    for name in _SUBPACKAGES:
+        importlib.import_module(f"{__name__}.{name}")
+
+
+def __getattr__(name: str):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+tool_registry.set_loader(load_tools)
 
-__all__ = ["ToolRegistry", "tool_registry", "tool"]
+__all__ = ["ToolRegistry", "tool_registry", "tool", "load_tools"]
@@ -5,14 +5,23 @@ Large codebase analysis using Gemini's 1M token context window.
 """
 
 import os
+import fnmatch
 import glob as glob_module
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
 from ...tools.registry import tool
 from ...services import types, MODELS, client, conversation_memory, CONVERSATION_MAX_TURNS
 from ...utils.tokens import estimate_tokens
 
 
+# Files with a NUL byte in their first 4KB are treated as binary
+BINARY_PROBE_SIZE = 4096
+
+# Threads used to read files concurrently
+MAX_READ_WORKERS = 16
+
+
 ANALYSIS_INSTRUCTIONS = {
     "architecture": """Focus on:
 - Overall project structure and organization
@@ -51,6 +60,31 @@ ANALYSIS_INSTRUCTIONS = {
 - Recommendations for improvement"""
 }
 
+# Prompt header skeleton: {instructions} is filled per analysis type at import
+# time, %(...)s fields per request
+_ANALYSIS_HEADER_SKELETON = """# CODEBASE ANALYSIS REQUEST
+
+## Analysis Type: %(analysis_type)s
+
+{instructions}
+
+## User Request
+%(prompt)s
+
+## Codebase Statistics
+- Files analyzed: %(file_count)d
+- Total size: %(total_chars)s characters (~%(estimated_tokens)s tokens)
+%(skipped_line)s
+
+## Codebase Contents
+
+"""
+
+_ANALYSIS_HEADERS = {
+    analysis_type: _ANALYSIS_HEADER_SKELETON.format(instructions=text.replace('%', '%%'))
+    for analysis_type, text in ANALYSIS_INSTRUCTIONS.items()
+}
+
 
 ANALYZE_CODEBASE_SCHEMA = {
     "type": "object",
@@ -82,6 +116,209 @@ ANALYZE_CODEBASE_SCHEMA = {
 }
 
 
+def _scandir(path: str) -> List[os.DirEntry]:
+    """List a directory, or return nothing if it can't be read."""
+    try:
+        with os.scandir(path or os.curdir) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """entry.is_dir(), treating errors (e.g. a symlink loop) as 'no'."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    """entry.is_file(), treating errors (e.g. a symlink loop) as 'no'."""
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _dir_key(path: str) -> Optional[Tuple[int, int]]:
+    """(st_dev, st_ino) of a directory (following symlinks), or None."""
+    try:
+        st = os.stat(path or os.curdir)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _is_cycle(path: str, ancestors: Tuple[str, ...]) -> bool:
+    """True if the symlinked directory at path leads back to an ancestor."""
+    key = _dir_key(path)
+    return key is None or any(_dir_key(a) == key for a in ancestors)
+
+
+def _walk_files(top: str) -> Iterator[str]:
+    """
+    Yield every file under top, in os.walk() order.
+
+    Uses the DirEntry type info from scandir, so no stat() per entry.
+    Like os.walk(), symlinked directories are not descended into.
+    """
+    stack = [top]
+    while stack:
+        subdirs = []
+        for entry in _scandir(stack.pop()):
+            if _is_dir(entry):
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            else:
+                yield entry.path
+        stack.extend(reversed(subdirs))
+
+
+def _glob_dirs(base: str, ancestors: Tuple[str, ...] = ()) -> Iterator[str]:
+    """
+    Yield base and every non-hidden directory below it (what ** matches).
+
+    Symlinked directories are followed like glob does, except one that
+    leads back to a directory on the current path (a cycle). Only symlinks
+    cost extra stat() calls.
+    """
+    yield base
+    ancestors += (base,)
+    for entry in _scandir(base):
+        if entry.name.startswith('.') or not _is_dir(entry):
+            continue
+        path = os.path.join(base, entry.name)
+        if entry.is_symlink() and _is_cycle(path, ancestors):
+            continue
+        yield from _glob_dirs(path, ancestors)
+
+
+def _glob_tree(base: str, ancestors: Tuple[str, ...] = ()) -> Iterator[str]:
+    """Yield every non-hidden file below base (a trailing **), depth first."""
+    ancestors += (base,)
+    for entry in _scandir(base):
+        if entry.name.startswith('.'):
+            continue
+        path = os.path.join(base, entry.name)
+        if _is_file(entry):
+            yield path
+        elif _is_dir(entry):
+            if entry.is_symlink() and _is_cycle(path, ancestors):
+                continue
+            yield from _glob_tree(path, ancestors)
+
+
+def _glob_files(base: str, parts: List[str]) -> Iterator[str]:
+    """
+    Yield files under base matching the remaining pattern components.
+
+    Follows glob.glob(recursive=True) semantics ('**' spans directories,
+    hidden names only match patterns starting with '.'), but checks types
+    via DirEntry instead of a separate os.path.isfile() per match.
+    """
+    part, rest = parts[0], parts[1:]
+
+    if part == '**':
+        if rest:
+            for directory in _glob_dirs(base):
+                yield from _glob_files(directory, rest)
+        else:
+            yield from _glob_tree(base)
+        return
+
+    if not glob_module.has_magic(part):
+        path = os.path.join(base, part)
+        if rest:
+            if os.path.isdir(path):
+                yield from _glob_files(path, rest)
+        elif os.path.isfile(path):
+            yield path
+        return
+
+    match_hidden = part.startswith('.')
+    for entry in _scandir(base):
+        if entry.name.startswith('.') and not match_hidden:
+            continue
+        if not fnmatch.fnmatch(entry.name, part):
+            continue
+        if rest:
+            if _is_dir(entry):
+                yield from _glob_files(os.path.join(base, entry.name), rest)
+        elif _is_file(entry):
+            yield os.path.join(base, entry.name)
+
+
+def _load_text_file(path: str, max_size: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read a UTF-8 text file, rejecting oversize and binary files early.
+
+    The size comes from fstat() and binary files are detected from the first
+    BINARY_PROBE_SIZE bytes, so neither is read or decoded in full.
+
+    Args:
+        path: File to read
+        max_size: Maximum file size in bytes
+
+    Returns:
+        (content, None) for a text file, or (None, reason) if skipped
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > max_size:
+            return None, f"too large: {size:,} bytes"
+
+        head = f.read(BINARY_PROBE_SIZE)
+        if b'\x00' in head:
+            return None, "binary file"
+
+        data = head + f.read(max_size + 1 - len(head))
+        if len(data) > max_size:  # grew since fstat()
+            return None, f"too large: over {max_size:,} bytes"
+
+    content = data.decode('utf-8', errors='replace')
+    if '\r' in content:
+        # Same newline translation as reading in text mode
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content, None
+
+
+def _iter_files(patterns: List[str]) -> Iterator[str]:
+    """
+    Yield the unique files named by paths, directories and glob patterns.
+
+    Order matches the previous glob/os.walk expansion: patterns in order,
+    directory entries in scandir order, duplicates dropped. The one
+    difference from glob: symlink cycles are not followed.
+    """
+    seen = set()
+    for pattern in patterns:
+        if '*' in pattern or '?' in pattern:
+            if os.altsep:
+                pattern = pattern.replace(os.altsep, os.sep)
+            parts = pattern.split(os.sep)
+            if not parts[-1]:
+                # A trailing separator only matches directories: no files
+                continue
+            # Literal leading components form the base directory
+            i = 0
+            while i < len(parts) - 1 and not glob_module.has_magic(parts[i]):
+                i += 1
+            base = os.sep.join(parts[:i]) or (os.sep if i else '')
+            paths = _glob_files(base, [p for p in parts[i:] if p])
+        elif os.path.isfile(pattern):
+            paths = (pattern,)
+        elif os.path.isdir(pattern):
+            paths = _walk_files(pattern)
+        else:
+            continue
+
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+
 @tool(
     name="gemini_analyze_codebase",
     description="Analyze large codebases using Gemini's 1M token context window. Perfect for architecture analysis, cross-file review, refactoring planning, and understanding complex projects. Supports 50+ files at once.",
@@ -98,29 +335,8 @@ def analyze_codebase(
     """
     Analyze large codebases using Gemini's 1M token context window.
     """
-    # Expand glob patterns and collect files
-    all_files = []
-    for pattern in files:
-        # Handle glob patterns
-        if '*' in pattern or '?' in pattern:
-            expanded = glob_module.glob(pattern, recursive=True)
-            all_files.extend([f for f in expanded if os.path.isfile(f)])
-        elif os.path.isfile(pattern):
-            all_files.append(pattern)
-        elif os.path.isdir(pattern):
-            # If directory, get all files recursively
-            for root, dirs, filenames in os.walk(pattern):
-                for filename in filenames:
-                    all_files.append(os.path.join(root, filename))
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_files = []
-    for f in all_files:
-        if f not in seen:
-            seen.add(f)
-            unique_files.append(f)
-    all_files = unique_files
+    # Expand glob patterns and directories into a unique, ordered file list
+    all_files = list(_iter_files(files))
 
     if not all_files:
         return "**Error**: No files found matching the provided patterns."
@@ -129,22 +345,21 @@ def analyze_codebase(
     file_contents = []
     total_chars = 0
     skipped_files = []
-    max_file_size = 100_000  # 100KB per file max
+    max_file_size = 100_000  # 100KB per file max (bytes on disk)
     max_total_bytes = 5_000_000  # 5MB total limit to prevent memory exhaustion
 
-    for filepath in all_files:
+    def load(filepath: str) -> Tuple[Optional[str], Optional[str]]:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-
-            # Skip very large files
-            if len(content) > max_file_size:
-                skipped_files.append(f"{filepath} (too large: {len(content):,} chars)")
-                continue
-
-            # Skip binary files
-            if '\x00' in content[:1000]:
-                skipped_files.append(f"{filepath} (binary file)")
+            return _load_text_file(filepath, max_file_size)
+        except Exception as e:
+            return None, f"error: {str(e)}"
+
+    # Reads are independent blocking I/O: overlap them, then apply the total
+    # budget in file order so the result doesn't depend on completion order
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(all_files))) as pool:
+        for filepath, (content, skip_reason) in zip(all_files, pool.map(load, all_files)):
+            if skip_reason:
+                skipped_files.append(f"{filepath} ({skip_reason})")
                 continue
 
             # Check total size limit
@@ -159,24 +374,11 @@ def analyze_codebase(
             })
             total_chars += len(content)
 
-        except Exception as e:
-            skipped_files.append(f"{filepath} (error: {str(e)})")
-
     if not file_contents:
         return "**Error**: Could not read any files. Check paths and permissions."
 
     # Estimate tokens
-    estimated_tokens = estimate_tokens(str(total_chars))
-
-    instructions = ANALYSIS_INSTRUCTIONS.get(analysis_type, ANALYSIS_INSTRUCTIONS["general"])
-
-    # Build the codebase content
-    codebase_content = []
-    for fc in file_contents:
-        ext = os.path.splitext(fc["path"])[1].lstrip('.')
-        codebase_content.append(f"### FILE: {fc['path']}\n```{ext}\n{fc['content']}\n```\n")
-
-    codebase_text = "\n".join(codebase_content)
+    estimated_tokens = sum(estimate_tokens(fc["content"]) for fc in file_contents)
 
     # Handle conversation memory
     thread_id, is_new, thread = conversation_memory.get_or_create_thread(
@@ -193,31 +395,34 @@ def analyze_codebase(
     files_list = [fc["path"] for fc in file_contents]
     conversation_memory.add_turn(thread_id, "user", prompt, "analyze_codebase", files_list)
 
-    # Build full prompt
-    full_prompt = f"""# CODEBASE ANALYSIS REQUEST
-
-## Analysis Type: {analysis_type.upper()}
-
-{instructions}
-
-## User Request
-{prompt}
-
-## Codebase Statistics
-- Files analyzed: {len(file_contents)}
-- Total size: {total_chars:,} characters (~{estimated_tokens:,} tokens)
-{f"- Skipped files: {len(skipped_files)}" if skipped_files else ""}
-
-## Codebase Contents
+    # Build full prompt as a list of pieces joined once, so file contents are
+    # copied a single time instead of per f-string/join/prefix step
+    prompt_parts = []
+    if conversation_context:
+        prompt_parts += [conversation_context, "\n\n=== NEW ANALYSIS REQUEST ===\n"]
+
+    prompt_parts.append(_ANALYSIS_HEADERS.get(analysis_type, _ANALYSIS_HEADERS["general"]) % {
+        "analysis_type": analysis_type.upper(),
+        "prompt": prompt,
+        "file_count": len(file_contents),
+        "total_chars": f"{total_chars:,}",
+        "estimated_tokens": f"{estimated_tokens:,}",
+        "skipped_line": f"- Skipped files: {len(skipped_files)}" if skipped_files else "",
+    })
+
+    for i, fc in enumerate(file_contents):
+        ext = os.path.splitext(fc["path"])[1].lstrip('.')
+        if i:
+            prompt_parts.append("\n")
+        prompt_parts += [f"### FILE: {fc['path']}\n```{ext}\n", fc["content"], "\n```\n"]
 
-{codebase_text}
+    prompt_parts.append("""
 
 ---
 Provide a thorough analysis based on the above codebase and the user's request.
-Structure your response clearly with sections and specific file references where applicable."""
+Structure your response clearly with sections and specific file references where applicable.""")
 
-    if conversation_context:
-        full_prompt = f"{conversation_context}\n\n=== NEW ANALYSIS REQUEST ===\n{full_prompt}"
+    full_prompt = "".join(prompt_parts)
 
     # Check prompt size (use higher limit since Gemini has 1M context)
     if len(full_prompt) > 3_000_000:  # ~750K tokens, leave room for response
@@ -242,7 +447,7 @@ Structure your response clearly with sections and specific file references where
 
         # Add assistant turn
         conversation_memory.add_turn(thread_id, "assistant", result_text, "analyze_codebase", [])
-        turn_count = len(conversation_memory.get_thread_history(thread_id))
+        turn_count = conversation_memory.get_turn_count(thread_id)
 
         # Build output
         output = f"""## Codebase Analysis Results
@@ -277,7 +482,7 @@ Structure your response clearly with sections and specific file references where
                 )
                 result_text = response.text
                 conversation_memory.add_turn(thread_id, "assistant", result_text, "analyze_codebase", [])
-                turn_count = len(conversation_memory.get_thread_history(thread_id))
+                turn_count = conversation_memory.get_turn_count(thread_id)
 
                 return f"""## Codebase Analysis Results (Flash Fallback)
 
@@ -18,6 +18,22 @@ from ...utils.file_refs import expand_file_references
 from ...utils.tokens import check_prompt_size
 
 
+# Patterns used on every response, compiled once
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{4,}')
+_GENERATED_CODE_RE = re.compile(r'<GENERATED_CODE>(.*?)</GENERATED_CODE>', re.DOTALL)
+_FILE_BLOCK_RE = re.compile(
+    r'<FILE\s+action=["\'](\w+)["\']\s+path=["\']([^"\'<>]+)["\']>\s*(.*?)\s*</FILE>',
+    re.DOTALL
+)
+_NEED_FILES_RE = re.compile(r'\{\s*"need_files"\s*:\s*\[(.*?)\]\s*\}', re.DOTALL)
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+# Absolute, home-relative or traversing paths are never written
+_UNSAFE_PATH_RE = re.compile(r'^[/~]|\.\.')
+
+_ALLOWED_ACTIONS = frozenset(('create', 'modify', 'delete'))
+
+
 def sanitize_xml_content(content: str) -> str:
     """
     Sanitize content before XML parsing to prevent injection attacks.
@@ -27,10 +43,10 @@ def sanitize_xml_content(content: str) -> str:
     - Limits excessive whitespace
     """
     # Remove null bytes and other control characters (keep \n, \r, \t)
-    sanitized = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', content)
+    sanitized = _CONTROL_CHARS_RE.sub('', content)
 
     # Limit consecutive blank lines to 3
-    sanitized = re.sub(r'\n{4,}', '\n\n\n', sanitized)
+    sanitized = _EXCESS_BLANK_LINES_RE.sub('\n\n\n', sanitized)
 
     return sanitized
 
@@ -52,7 +68,7 @@ def parse_generated_code(xml_content: str) -> List[Dict[str, str]]:
     files = []
 
     # Extract content between <GENERATED_CODE> tags if present
-    gen_match = re.search(r'<GENERATED_CODE>(.*?)</GENERATED_CODE>', xml_content, re.DOTALL)
+    gen_match = _GENERATED_CODE_RE.search(xml_content)
     if gen_match:
         xml_content = gen_match.group(1)
 
@@ -66,21 +82,17 @@ def parse_generated_code(xml_content: str) -> List[Dict[str, str]]:
         # Fallback: try regex for malformed XML (LLM output may not be perfect)
         return _parse_with_regex_fallback(xml_content)
 
-    for file_elem in tree.findall('.//FILE'):
+    for file_elem in tree.iter('FILE'):
         action = file_elem.get('action', '').strip()
         path = file_elem.get('path', '').strip()
         content = file_elem.text or ''
 
         # Validate action (whitelist only)
-        if action not in ('create', 'modify', 'delete'):
-            continue
-
-        # Sanitize path (prevent directory traversal)
-        if '..' in path or path.startswith('/') or path.startswith('~'):
+        if action not in _ALLOWED_ACTIONS:
             continue
 
-        # Skip empty paths
-        if not path:
+        # Sanitize path (prevent directory traversal); skip empty paths
+        if not path or _UNSAFE_PATH_RE.search(path):
             continue
 
         files.append({
@@ -101,33 +113,48 @@ def _parse_with_regex_fallback(xml_content: str) -> List[Dict[str, str]]:
     """
     files = []
 
-    # More restrictive regex pattern
-    pattern = r'<FILE\s+action=["\'](\w+)["\']\s+path=["\']([^"\'<>]+)["\']>\s*(.*?)\s*</FILE>'
-    matches = re.findall(pattern, xml_content, re.DOTALL)
-
-    for action, path, content in matches:
+    # Stream matches; a block's content is only extracted once it passes validation
+    for match in _FILE_BLOCK_RE.finditer(xml_content):
         # Validate action (whitelist only)
-        if action not in ('create', 'modify', 'delete'):
-            continue
-
-        # Sanitize path (prevent directory traversal)
-        path = path.strip()
-        if '..' in path or path.startswith('/') or path.startswith('~'):
+        action = match.group(1)
+        if action not in _ALLOWED_ACTIONS:
             continue
 
-        # Skip empty paths
-        if not path:
+        # Sanitize path (prevent directory traversal); skip empty paths
+        path = match.group(2).strip()
+        if not path or _UNSAFE_PATH_RE.search(path):
             continue
 
         files.append({
             "action": action,
             "path": path,
-            "content": content.strip()
+            "content": match.group(3).strip()
         })
 
     return files
 
 
+def _write_text(path: str, content: str) -> None:
+    """
+    Write text to a file as UTF-8 with one encode and raw os.write() calls.
+
+    Skips the TextIOWrapper/BufferedWriter stack; newlines are still
+    translated to os.linesep as text mode would (Windows).
+    """
+    data = content.encode('utf-8')
+    if os.linesep != '\n':
+        data = data.replace(b'\n', os.linesep.encode())
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        # os.write() may write less than asked; loop until everything is out
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def save_generated_files(files: List[Dict[str, str]], output_dir: str) -> List[Dict[str, Any]]:
     """
     Save parsed files to disk.
@@ -135,6 +162,8 @@ def save_generated_files(files: List[Dict[str, str]], output_dir: str) -> List[D
     Returns list of results with status for each file.
     """
     results = []
+    # Directories already created or known to exist
+    ready_dirs = set()
 
     for file_info in files:
         action = file_info["action"]
@@ -148,21 +177,21 @@ def save_generated_files(files: List[Dict[str, str]], output_dir: str) -> List[D
             # Validate path is within sandbox
             validated_path = validate_path(full_path)
 
-            # Create directories if needed
+            # Create directories if needed (once per distinct directory)
             dir_path = os.path.dirname(validated_path)
-            if dir_path and not os.path.exists(dir_path):
+            if dir_path and dir_path not in ready_dirs:
                 os.makedirs(dir_path, exist_ok=True)
+                ready_dirs.add(dir_path)
 
             # Write file
-            with open(validated_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text(validated_path, content)
 
             results.append({
                 "path": rel_path,
                 "full_path": validated_path,
                 "action": action,
                 "status": "success",
-                "lines": len(content.split('\n'))
+                "lines": content.count('\n') + 1
             })
 
         except PermissionError as e:
@@ -206,6 +235,95 @@ STYLE_INSTRUCTIONS = {
 }
 
 
+# Prompt skeletons: {style_instruction} is filled per style at import time,
+# %(...)s fields per request
+_CODE_PROMPT_SKELETON = """# CODE GENERATION REQUEST
+
+## Task
+%(prompt)s
+%(lang_hint)s
+
+{style_instruction}
+
+## Output Format
+You MUST return code in this EXACT XML format. This format allows automated processing.
+
+```xml
+<GENERATED_CODE>
+<FILE action="create" path="relative/path/to/newfile.ext">
+// Complete file contents here
+// Include ALL necessary code - imports, types, implementation
+</FILE>
+
+<FILE action="modify" path="relative/path/to/existing.ext">
+// Show the COMPLETE modified file
+// Or use comments to indicate unchanged sections:
+// ... existing imports ...
+
+// NEW OR MODIFIED CODE HERE
+
+// ... rest of file unchanged ...
+</FILE>
+</GENERATED_CODE>
+```
+
+## Rules
+1. Use action="create" for new files
+2. Use action="modify" for changes to existing files
+3. Paths should be relative to project root
+4. Include complete, runnable code - no placeholders like "// add your code here"
+5. Match the code style from context files if provided
+6. Each FILE block must contain the full file OR clearly marked sections
+
+## Need More Context?
+If you need to see additional files before generating code, respond with ONLY:
+```json
+{{"need_files": ["path/to/file1.ts", "path/to/file2.py"]}}
+```
+Do NOT include any other text. I will provide the requested files and ask again.
+
+%(context_section)s
+
+## Generate Code Now
+Return ONLY the <GENERATED_CODE> block with the requested implementation.
+If you need more files first, return ONLY the JSON need_files request.
+"""
+
+_RETRY_PROMPT_SKELETON = """# CODE GENERATION REQUEST (RETRY WITH ADDITIONAL FILES)
+
+## Task
+%(prompt)s
+%(lang_hint)s
+
+{style_instruction}
+
+## Output Format
+You MUST return code in this EXACT XML format:
+```xml
+<GENERATED_CODE>
+<FILE action="create" path="relative/path/to/file.ext">
+// Complete file contents
+</FILE>
+</GENERATED_CODE>
+```
+
+## Context Files (match this style)
+%(context)s
+
+## Generate Code Now
+You now have the additional files you requested. Return ONLY the <GENERATED_CODE> block.
+"""
+
+_CODE_PROMPTS = {
+    style: _CODE_PROMPT_SKELETON.format(style_instruction=text.replace('%', '%%'))
+    for style, text in STYLE_INSTRUCTIONS.items()
+}
+_RETRY_PROMPTS = {
+    style: _RETRY_PROMPT_SKELETON.format(style_instruction=text.replace('%', '%%'))
+    for style, text in STYLE_INSTRUCTIONS.items()
+}
+
+
 GENERATE_CODE_SCHEMA = {
     "type": "object",
     "properties": {
@@ -270,15 +388,21 @@ def generate_code(
     """
     # Build context from files
     context_content = ""
+    # References whose contents are already in the context; each file is
+    # read once per call, including across the need_files retry
+    included_refs = set()
     if context_files:
         context_parts = []
         for file_ref in context_files:
             # Ensure @ prefix for expand_file_references
             if not file_ref.startswith('@'):
                 file_ref = '@' + file_ref
+            if file_ref in included_refs:
+                continue
             expanded = expand_file_references(file_ref)
             if expanded != file_ref:  # File was found and expanded
                 context_parts.append(expanded)
+                included_refs.add(file_ref)
         if context_parts:
             context_content = "\n\n".join(context_parts)
 
@@ -288,65 +412,16 @@ def generate_code(
     if size_error:
         return f"**Error**: {size_error['message']}"
 
-    style_instruction = STYLE_INSTRUCTIONS.get(style, STYLE_INSTRUCTIONS["production"])
-
     # Language detection hint
     lang_hint = ""
     if language != "auto":
         lang_hint = f"\n**Target Language:** {language}"
 
     # Build the prompt
-    full_prompt = f"""# CODE GENERATION REQUEST
-
-## Task
-{prompt}
-{lang_hint}
-
-{style_instruction}
-
-## Output Format
-You MUST return code in this EXACT XML format. This format allows automated processing.
-
-```xml
-<GENERATED_CODE>
-<FILE action="create" path="relative/path/to/newfile.ext">
-// Complete file contents here
-// Include ALL necessary code - imports, types, implementation
-</FILE>
-
-<FILE action="modify" path="relative/path/to/existing.ext">
-// Show the COMPLETE modified file
-// Or use comments to indicate unchanged sections:
-// ... existing imports ...
-
-// NEW OR MODIFIED CODE HERE
-
-// ... rest of file unchanged ...
-</FILE>
-</GENERATED_CODE>
-```
-
-## Rules
-1. Use action="create" for new files
-2. Use action="modify" for changes to existing files
-3. Paths should be relative to project root
-4. Include complete, runnable code - no placeholders like "// add your code here"
-5. Match the code style from context files if provided
-6. Each FILE block must contain the full file OR clearly marked sections
-
-## Need More Context?
-If you need to see additional files before generating code, respond with ONLY:
-```json
-{{"need_files": ["path/to/file1.ts", "path/to/file2.py"]}}
-```
-Do NOT include any other text. I will provide the requested files and ask again.
-
-{f'## Context Files (match this style){chr(10)}{context_content}' if context_content else ''}
-
-## Generate Code Now
-Return ONLY the <GENERATED_CODE> block with the requested implementation.
-If you need more files first, return ONLY the JSON need_files request.
-"""
+    context_section = f"## Context Files (match this style)\n{context_content}" if context_content else ""
+    full_prompt = _CODE_PROMPTS.get(style, _CODE_PROMPTS["production"]) % {
+        "prompt": prompt, "lang_hint": lang_hint, "context_section": context_section
+    }
 
     model_id = MODELS.get(model, MODELS["pro"])
 
@@ -364,48 +439,35 @@ If you need more files first, return ONLY the JSON need_files request.
         result = response.text
 
         # JSON More Info Protocol - detect need_files requests
-        need_files_match = re.search(r'\{\s*"need_files"\s*:\s*\[(.*?)\]\s*\}', result, re.DOTALL)
+        need_files_match = _NEED_FILES_RE.search(result)
         if need_files_match and "<GENERATED_CODE>" not in result:
             # Gemini is requesting more files
             try:
                 files_str = need_files_match.group(1)
-                requested_files = re.findall(r'"([^"]+)"', files_str)
+                requested_files = _QUOTED_RE.findall(files_str)
 
                 if requested_files:
                     additional_context = []
+                    already_included = False
                     for file_path in requested_files[:5]:  # Limit to 5 files
                         file_ref = f"@{file_path}" if not file_path.startswith('@') else file_path
+                        if file_ref in included_refs:
+                            # Already in the context; don't read or send it twice
+                            already_included = True
+                            continue
                         expanded = expand_file_references(file_ref)
                         if expanded != file_ref:
                             additional_context.append(expanded)
+                            included_refs.add(file_ref)
 
-                    if additional_context:
-                        new_context = context_content + "\n\n" + "\n\n".join(additional_context)
-
-                        retry_prompt = f"""# CODE GENERATION REQUEST (RETRY WITH ADDITIONAL FILES)
-
-## Task
-{prompt}
-{lang_hint}
-
-{style_instruction}
-
-## Output Format
-You MUST return code in this EXACT XML format:
-```xml
-<GENERATED_CODE>
-<FILE action="create" path="relative/path/to/file.ext">
-// Complete file contents
-</FILE>
-</GENERATED_CODE>
-```
-
-## Context Files (match this style)
-{new_context}
+                    if additional_context or already_included:
+                        new_context = context_content
+                        if additional_context:
+                            new_context += "\n\n" + "\n\n".join(additional_context)
 
-## Generate Code Now
-You now have the additional files you requested. Return ONLY the <GENERATED_CODE> block.
-"""
+                        retry_prompt = _RETRY_PROMPTS.get(style, _RETRY_PROMPTS["production"]) % {
+                            "prompt": prompt, "lang_hint": lang_hint, "context": new_context
+                        }
                         retry_response = generate_with_fallback(
                             model_id=model_id,
                             contents=retry_prompt,
@@ -463,32 +525,26 @@ You now have the additional files you requested. Return ONLY the <GENERATED_CODE
                         ""
                     ]
 
-                    for f in files:
-                        action_emoji = "➕" if f["action"] == "create" else "✏️" if f["action"] == "modify" else "🗑️"
-                        lines = len(f["content"].split('\n'))
-                        full_path = os.path.join(validated_dir, f["path"])
-                        exists = os.path.exists(full_path)
-                        status = "(exists)" if exists else "(new)"
-
-                        summary_lines.append(f"{action_emoji} **{f['action']}** `{f['path']}` - {lines} lines {status}")
-
-                    summary_lines.extend([
+                    # One pass over the files fills both sections
+                    preview_lines = [
                         "",
                         "### Preview of generated code:",
                         ""
-                    ])
-
+                    ]
                     for f in files:
-                        ext = os.path.splitext(f["path"])[1].lstrip('.') or 'txt'
-                        preview = f["content"][:2000]
-                        if len(f["content"]) > 2000:
-                            preview += f"\n\n... ({len(f['content']) - 2000} more chars)"
-                        summary_lines.append(f"#### {f['path']}")
-                        summary_lines.append(f"```{ext}")
-                        summary_lines.append(preview)
-                        summary_lines.append("```")
-                        summary_lines.append("")
+                        path, content = f["path"], f["content"]
+                        action_emoji = "➕" if f["action"] == "create" else "✏️" if f["action"] == "modify" else "🗑️"
+                        lines = content.count('\n') + 1
+                        status = "(exists)" if os.path.exists(os.path.join(validated_dir, path)) else "(new)"
+                        summary_lines.append(f"{action_emoji} **{f['action']}** `{path}` - {lines} lines {status}")
+
+                        ext = os.path.splitext(path)[1].lstrip('.') or 'txt'
+                        preview = content[:2000]
+                        if len(content) > 2000:
+                            preview += f"\n\n... ({len(content) - 2000} more chars)"
+                        preview_lines += [f"#### {path}", f"```{ext}", preview, "```", ""]
 
+                    summary_lines += preview_lines
                     summary_lines.extend([
                         "---",
                         "**This was a dry run. No files were written.**",
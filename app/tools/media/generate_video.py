@@ -111,15 +111,20 @@ def generate_video(
 
         # Poll for completion (video generation can take 1-6 minutes)
         max_wait = 360  # 6 minutes max
-        poll_interval = 10
-
-        # Sync polling - async version caused deadlocks in FastMCP
-        elapsed = 0
-        while not operation.done and elapsed < max_wait:
-            time.sleep(poll_interval)
-            elapsed += poll_interval
-            log_progress(f"Video generation in progress... ({elapsed}s elapsed)")
+        poll_interval = 2
+        max_poll_interval = 10
+
+        # Sync polling - async version caused deadlocks in FastMCP. The server
+        # runs tools in a worker thread, so sleeping here leaves the event loop
+        # free. Back off 2s -> 10s; the deadline includes time spent in get().
+        start = time.monotonic()
+        deadline = start + max_wait
+        while not operation.done and time.monotonic() < deadline:
+            time.sleep(min(poll_interval, max(0, deadline - time.monotonic())))
+            poll_interval = min(poll_interval * 2, max_poll_interval)
             operation = client.operations.get(operation)
+            elapsed = int(time.monotonic() - start)
+            log_progress(f"Video generation in progress... ({elapsed}s elapsed)")
 
         if not operation.done:
             log_progress("Video generation timed out")
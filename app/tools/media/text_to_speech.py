@@ -6,6 +6,7 @@ Generate speech from text using Gemini TTS.
 
 import time
 import wave
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from ...tools.registry import tool
@@ -51,6 +52,18 @@ TEXT_TO_SPEECH_SCHEMA = {
 }
 
 
+@lru_cache(maxsize=len(TTS_VOICES))
+def _single_speaker_config(voice: str):
+    """SpeechConfig for one prebuilt voice (built once per voice, then reused)."""
+    return types.SpeechConfig(
+        voice_config=types.VoiceConfig(
+            prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                voice_name=voice
+            )
+        )
+    )
+
+
 @tool(
     name="gemini_text_to_speech",
     description="Convert text to speech using Gemini TTS. Supports single-speaker and multi-speaker (up to 2) audio with 30 voice options. Control style, tone, accent, and pace with natural language.",
@@ -103,13 +116,7 @@ def text_to_speech(
             if voice not in TTS_VOICES:
                 voice = "Kore"
 
-            speech_config = types.SpeechConfig(
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                        voice_name=voice
-                    )
-                )
-            )
+            speech_config = _single_speaker_config(voice)
 
         # Generate audio
         response = client.models.generate_content(
@@ -5,14 +5,35 @@ Create and manage File Search Stores for RAG queries.
 """
 
 import os
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from ...tools.registry import tool
 from ...services import client
 from ...core import log_progress
 
 
+# Display name -> (full store path, expiry), filled from list/create calls so
+# repeat queries by display name skip the file_search_stores.list() round-trip.
+# Entries expire so stores deleted or recreated elsewhere are picked up again.
+_STORE_NAME_TTL = 300.0
+_store_names: Dict[str, Tuple[str, float]] = {}
+_store_names_lock = threading.Lock()
+
+
+def _refresh_store_names(stores) -> None:
+    """Rebuild the display-name map from a list() result (first match wins)."""
+    expires = time.monotonic() + _STORE_NAME_TTL
+    names: Dict[str, Tuple[str, float]] = {}
+    for store in stores:
+        if store.display_name:
+            names.setdefault(store.display_name, (store.name, expires))
+    with _store_names_lock:
+        _store_names.clear()
+        _store_names.update(names)
+
+
 def resolve_store_name(store_name: str) -> str:
     """
     Resolve a store name to its full path.
@@ -34,14 +55,20 @@ def resolve_store_name(store_name: str) -> str:
     if store_name.startswith("fileSearchStores/"):
         return store_name
 
+    with _store_names_lock:
+        cached = _store_names.get(store_name)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
     # Search by display name
-    stores = client.file_search_stores.list()
+    stores = list(client.file_search_stores.list())
+    _refresh_store_names(stores)
     for store in stores:
         if store.display_name == store_name:
             return store.name
 
     # Not found
-    available = [s.display_name for s in stores] if stores else []
+    available = [s.display_name for s in stores]
     raise ValueError(
         f"Store '{store_name}' not found. "
         f"Available stores: {available or 'none'}"
@@ -68,6 +95,11 @@ def create_file_store(name: str) -> str:
     store = client.file_search_stores.create(
         config={"display_name": name}
     )
+    now = time.monotonic()
+    with _store_names_lock:
+        cached = _store_names.get(name)
+        if not cached or cached[1] <= now:
+            _store_names[name] = (store.name, now + _STORE_NAME_TTL)
     return f"Created File Search Store:\n- Name: {store.name}\n- Display Name: {name}\n\nUse this store_name for uploads and queries: {store.name}"
 
 
@@ -138,7 +170,8 @@ LIST_FILE_STORES_SCHEMA = {
 )
 def list_file_stores() -> str:
     """List all File Search Stores."""
-    stores = client.file_search_stores.list()
+    stores = list(client.file_search_stores.list())
+    _refresh_store_names(stores)
     if not stores:
         return "No File Search Stores found. Create one with gemini_create_file_store."
 
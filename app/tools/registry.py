@@ -21,11 +21,12 @@ Usage:
 
 import sys
 import inspect
+import threading
 import importlib
 import importlib.util
 from pathlib import Path
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
 from dataclasses import dataclass, field
 
 try:
@@ -62,7 +63,40 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, ToolDefinition] = {}
-        self._disabled: List[str] = []
+        self._disabled: Set[str] = set()
+        self._tools_list_cache: Optional[List[Dict[str, Any]]] = None
+        self._loader: Optional[Callable[[], None]] = None
+        self._loader_lock = threading.RLock()
+        self._loading = False
+
+    def set_loader(self, loader: Callable[[], None]) -> None:
+        """
+        Set a callable that imports (and so registers) the built-in tools.
+
+        It runs once, the first time the registry is queried, so tool
+        modules are only imported when a tool is actually needed.
+        """
+        self._loader = loader
+
+    def ensure_loaded(self) -> None:
+        """
+        Run the pending loader, if any (see set_loader()).
+
+        Concurrent callers wait for the load to finish. The loader is only
+        cleared once it succeeds, so a failed load is retried on the next
+        query. Queries made by the loader itself return immediately.
+        """
+        if self._loader is None:
+            return
+        with self._loader_lock:
+            if self._loader is None or self._loading:
+                return
+            self._loading = True
+            try:
+                self._loader()
+                self._loader = None
+            finally:
+                self._loading = False
 
     def register(
         self,
@@ -104,6 +138,7 @@ class ToolRegistry:
             input_model=input_model,
             tags=tags or []
         )
+        self._tools_list_cache = None
 
     def _generate_schema(self, handler: Callable, input_model: Type = None) -> Dict[str, Any]:
         """Generate JSON schema from function signature or Pydantic model."""
@@ -166,6 +201,7 @@ class ToolRegistry:
 
     def get(self, name: str) -> Optional[ToolDefinition]:
         """Get tool by name."""
+        self.ensure_loaded()
         return self._tools.get(name)
 
     def execute(self, name: str, args: Dict[str, Any]) -> Any:
@@ -183,7 +219,7 @@ class ToolRegistry:
             KeyError: If tool not found
             ValueError: If validation fails
         """
-        tool_def = self._tools.get(name)
+        tool_def = self.get(name)
         if not tool_def:
             raise KeyError(f"Unknown tool: {name}")
 
@@ -195,15 +231,23 @@ class ToolRegistry:
         return tool_def.handler(**args)
 
     def list_tools(self) -> List[Dict[str, Any]]:
-        """Get MCP-compatible tool definitions list."""
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": tool.input_schema
-            }
-            for tool in self._tools.values()
-        ]
+        """
+        Get MCP-compatible tool definitions list.
+
+        The list is built once and reused until the registry changes
+        (register/disable), since the tool set is static after startup.
+        """
+        self.ensure_loaded()
+        if self._tools_list_cache is None:
+            self._tools_list_cache = [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "inputSchema": tool.input_schema
+                }
+                for tool in self._tools.values()
+            ]
+        return list(self._tools_list_cache)
 
     # Alias for backwards compatibility
     def get_tools_list(self) -> List[Dict[str, Any]]:
@@ -216,9 +260,10 @@ class ToolRegistry:
 
     def disable(self, names: List[str]) -> None:
         """Disable tools by name."""
-        self._disabled.extend(names)
+        self._disabled.update(names)
         for name in names:
             self._tools.pop(name, None)
+        self._tools_list_cache = None
 
     def discover_plugins(self, plugins_dir: Path) -> int:
         """
@@ -313,9 +358,11 @@ class ToolRegistry:
             return 0
 
     def __len__(self) -> int:
+        self.ensure_loaded()
         return len(self._tools)
 
     def __contains__(self, name: str) -> bool:
+        self.ensure_loaded()
         return name in self._tools
 
 
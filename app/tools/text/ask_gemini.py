@@ -238,7 +238,7 @@ def ask_gemini(
     )
 
     # Index the conversation (v3.3.0)
-    turn_count = len(conversation_memory.get_thread_history(thread_id))
+    turn_count = conversation_memory.get_turn_count(thread_id)
     if is_new:
         # Generate title if not provided
         conv_title = title or conversation_memory.generate_title(original_prompt)
@@ -1,5 +1,6 @@
 """Line numbering utilities for code display."""
 
+import os
 
 # File extensions to skip line numbering
 SKIP_LINE_NUMBERS = {'.json', '.md', '.txt', '.csv', '.yaml', '.yml', '.toml', '.ini', '.cfg'}
@@ -42,6 +43,5 @@ def should_add_line_numbers(filename: str) -> bool:
     Returns:
         True if line numbers should be added
     """
-    import os
     ext = os.path.splitext(filename)[1].lower()
     return ext not in SKIP_LINE_NUMBERS
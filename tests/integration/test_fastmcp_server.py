@@ -116,6 +116,42 @@ class TestMCPResources:
         assert hasattr(mcp, '_resource_manager')
 
 
+class TestDisabledTools:
+    """GEMINI_DISABLED_TOOLS handling at startup."""
+
+    def _run(self, fake_mcp, disabled):
+        from unittest.mock import patch
+
+        import anyio
+
+        from app import server
+
+        with patch.object(server, "mcp", fake_mcp), \
+                patch.object(server.config, "disabled_tools_set", frozenset(disabled)):
+            return anyio.run(server._remove_disabled_tools)
+
+    def test_disabled_tools_removed(self):
+        """Registered disabled tools are removed; unknown names are ignored."""
+        import anyio
+        from mcp.server.fastmcp import FastMCP
+
+        fake_mcp = FastMCP("test")
+        for name in ("keep", "drop"):
+            fake_mcp.add_tool(lambda: None, name=name)
+
+        assert self._run(fake_mcp, {"drop", "missing"}) == 1
+        assert [t.name for t in anyio.run(fake_mcp.list_tools)] == ["keep"]
+
+    def test_older_mcp_without_remove_tool(self):
+        """Without FastMCP.remove_tool() startup continues and nothing is removed."""
+        from types import SimpleNamespace
+
+        async def list_tools():
+            return [SimpleNamespace(name="drop")]
+
+        assert self._run(SimpleNamespace(list_tools=list_tools), {"drop"}) == 0
+
+
 class TestServerEntry:
     """Server entry point tests."""
 
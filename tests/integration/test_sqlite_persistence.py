@@ -17,6 +17,7 @@ import time
 import sqlite3
 from pathlib import Path
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -90,6 +91,40 @@ class TestDatabaseCreation:
         assert mode.lower() == "wal"
         memory.close()
 
+    def test_legacy_schema_migration(self, temp_db_dir):
+        """Pre-existing databases get turn_count and updated_at_ts backfilled."""
+        from app.services.persistence import PersistentConversationMemory
+
+        db_path = os.path.join(temp_db_dir, "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE conversations (
+                id TEXT PRIMARY KEY, created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL, metadata TEXT DEFAULT '{}'
+            );
+            CREATE TABLE turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id TEXT NOT NULL,
+                role TEXT NOT NULL, content TEXT NOT NULL, timestamp TEXT NOT NULL,
+                tool_name TEXT, files TEXT DEFAULT '[]'
+            );
+        """)
+        now = datetime.utcnow().isoformat()
+        conn.execute("INSERT INTO conversations VALUES ('t1', ?, ?, '{}')", (now, now))
+        conn.executemany(
+            "INSERT INTO turns (conversation_id, role, content, timestamp) VALUES ('t1', 'user', ?, ?)",
+            [("a", now), ("b", now)]
+        )
+        conn.commit()
+        conn.close()
+
+        memory = PersistentConversationMemory(db_path=db_path, max_turns=3)
+
+        assert memory.get_thread("t1") is not None  # updated_at_ts backfilled
+        assert memory.get_turn_count("t1") == 2
+        assert memory.add_turn("t1", "user", "c") is True
+        assert memory.add_turn("t1", "user", "d") is False
+        memory.close()
+
 
 class TestThreadOperations:
     """Thread CRUD operations tests."""
@@ -132,6 +167,16 @@ class TestThreadOperations:
         assert is_new is True
         assert thread_id != "nonexistent-thread-id"
 
+    def test_new_thread_info_matches_stored_row(self, persistence_instance):
+        """The info returned for a new thread is what get_thread reads back."""
+        thread_id, is_new, thread = persistence_instance.get_or_create_thread(
+            metadata={"tool": "ask_gemini"}
+        )
+
+        assert is_new is True
+        assert thread == persistence_instance.get_thread(thread_id)
+        assert thread["metadata"] == {"tool": "ask_gemini"}
+
 
 class TestTurnManagement:
     """Conversation turn management tests."""
@@ -216,6 +261,91 @@ class TestTurnManagement:
         # Should only keep last 10
         assert len(turns) <= 10
 
+    def test_add_turn_unknown_thread(self, persistence_instance):
+        """Turns for a missing thread are rejected and not stored."""
+        assert persistence_instance.add_turn("missing", "user", "hello") is False
+        assert persistence_instance.get_thread_history("missing") == []
+
+    def test_index_turn_count_tracks_turns(self, persistence_instance):
+        """The conversation index reports the stored turn count."""
+        thread_id = persistence_instance.create_thread()
+        persistence_instance.index_conversation(thread_id, "Title")
+        persistence_instance.add_turn(thread_id, "user", "one")
+        persistence_instance.add_turn(thread_id, "assistant", "two")
+        persistence_instance.update_index_activity(thread_id)
+
+        entry = persistence_instance.list_conversations()[0]
+        assert entry["turn_count"] == 2
+        assert persistence_instance.get_turn_count(thread_id) == 2
+
+    def test_add_turn_reports_limit(self, persistence_instance):
+        """add_turn returns False once max_turns is reached."""
+        thread_id = persistence_instance.create_thread()
+        results = [
+            persistence_instance.add_turn(thread_id, "user", f"Message {i}")
+            for i in range(11)
+        ]
+
+        assert results == [True] * 10 + [False]
+
+    def test_turn_to_dict(self):
+        """to_dict has every dataclass field and copies the files list."""
+        from dataclasses import asdict
+
+        from app.services.persistence import ConversationTurn
+
+        turn = ConversationTurn("user", "hi", "2025-01-01T00:00:00", "ask_gemini", ["a.py"])
+        data = turn.to_dict()
+        data["files"].append("b.py")
+
+        assert turn.to_dict() == asdict(turn)
+        assert turn.files == ["a.py"]
+
+    def test_history_reads_need_no_sort(self, persistence_instance):
+        """History and context reads walk idx_turns_conversation in order."""
+        with persistence_instance._get_connection() as conn:
+            for order in ("id", "id DESC"):
+                plan = " ".join(
+                    row[3] for row in conn.execute(
+                        f"""EXPLAIN QUERY PLAN
+                            SELECT role, content, timestamp, tool_name, files FROM turns
+                            WHERE conversation_id = ? ORDER BY {order}""",
+                        ("t",)
+                    )
+                )
+                assert "idx_turns_conversation" in plan
+                assert "TEMP B-TREE" not in plan
+
+    def test_add_turns_batch(self, persistence_instance):
+        """add_turns stores a batch in order and counts every turn."""
+        thread_id = persistence_instance.create_thread()
+        added = persistence_instance.add_turns(thread_id, [
+            ("user", "question", "ask_gemini", ["a.py"]),
+            ("assistant", "answer", "ask_gemini", None),
+        ])
+
+        turns = persistence_instance.get_thread_history(thread_id)
+        assert added == 2
+        assert [(t.role, t.content, t.files) for t in turns] == [
+            ("user", "question", ["a.py"]),
+            ("assistant", "answer", []),
+        ]
+        assert persistence_instance.get_turn_count(thread_id) == 2
+
+    def test_add_turns_over_limit_adds_nothing(self, persistence_instance):
+        """A batch that would exceed max_turns is rejected as a whole."""
+        thread_id = persistence_instance.create_thread()
+        persistence_instance.add_turns(
+            thread_id, [("user", f"Message {i}", None, None) for i in range(9)]
+        )
+
+        added = persistence_instance.add_turns(
+            thread_id, [("user", "x", None, None), ("assistant", "y", None, None)]
+        )
+
+        assert added == 0
+        assert persistence_instance.get_turn_count(thread_id) == 9
+
 
 class TestBuildContext:
     """Context building tests."""
@@ -246,6 +376,136 @@ class TestBuildContext:
         assert len(turns) == 0
 
 
+class TestConversationListing:
+    """list_conversations() ordering and query plan."""
+
+    def test_mode_listing_uses_index_order(self, persistence_instance):
+        """Mode-filtered listing walks an index instead of sorting."""
+        with persistence_instance._get_connection() as conn:
+            plan = " ".join(
+                row[3] for row in conn.execute(
+                    """EXPLAIN QUERY PLAN
+                       SELECT id FROM conversation_index WHERE mode = ?
+                       ORDER BY last_used_at DESC LIMIT 20""",
+                    ("local",)
+                )
+            )
+
+        assert "idx_conversation_index_mode_last_used" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_most_recent_first(self, persistence_instance):
+        """Conversations are listed by last use, newest first."""
+        first = persistence_instance.create_thread()
+        persistence_instance.index_conversation(first, "first")
+        second = persistence_instance.create_thread()
+        persistence_instance.index_conversation(second, "second")
+        persistence_instance.update_index_activity(first)
+
+        listed = persistence_instance.list_conversations(mode="local")
+
+        assert [c["id"] for c in listed] == [first, second]
+
+
+class TestConversationSearch:
+    """Conversation index search (FTS5 with LIKE fallback)."""
+
+    def _index(self, memory, title, first_prompt=None):
+        thread_id = memory.create_thread()
+        memory.index_conversation(thread_id, title, first_prompt=first_prompt)
+        return thread_id
+
+    def test_substring_search(self, persistence_instance):
+        """Search matches substrings of title and first_prompt, any case."""
+        self._index(persistence_instance, "Database design", "index a DB")
+        self._index(persistence_instance, "Cooking", "pasta recipe")
+
+        def titles(search):
+            return [c["title"] for c in persistence_instance.list_conversations(search=search)]
+
+        assert titles("base") == ["Database design"]
+        assert titles("PASTA") == ["Cooking"]
+        assert titles("DB") == ["Database design"]  # short query: LIKE fallback
+        assert titles('"x" OR y*') == []  # FTS syntax is matched literally
+
+    def test_search_follows_renames_and_deletes(self, persistence_instance):
+        """The search index stays in sync with conversation_index."""
+        thread_id = self._index(persistence_instance, "Old title")
+        persistence_instance.index_conversation(thread_id, "New title")
+
+        assert persistence_instance.list_conversations(search="Old") == []
+        assert persistence_instance.get_conversation_by_title("new ti")["id"] == thread_id
+
+        persistence_instance.delete_from_index(thread_id)
+        assert persistence_instance.list_conversations(search="title") == []
+
+    def test_existing_index_rows_searchable(self, temp_db_dir):
+        """Rows indexed before the FTS table existed are searchable."""
+        from app.services.persistence import PersistentConversationMemory
+
+        db_path = os.path.join(temp_db_dir, "fts_migration.db")
+        memory = PersistentConversationMemory(db_path=db_path)
+        thread_id = self._index(memory, "Legacy conversation")
+        with memory._get_connection() as conn:
+            conn.executescript("""
+                DROP TRIGGER conversation_fts_insert;
+                DROP TRIGGER conversation_fts_delete;
+                DROP TRIGGER conversation_fts_update;
+                DROP TABLE conversation_fts;
+            """)
+        memory.close()
+
+        memory = PersistentConversationMemory(db_path=db_path)
+        assert [c["id"] for c in memory.list_conversations(search="legacy")] == [thread_id]
+        memory.close()
+
+    def test_search_survives_vacuum(self, persistence_instance):
+        """The search index points at stable row ids, so VACUUM can't desync it."""
+        ids = {title: self._index(persistence_instance, title)
+               for title in ("alpha one", "beta two", "gamma three", "delta four")}
+        persistence_instance.delete_from_index(ids["alpha one"])
+        persistence_instance.delete_from_index(ids["gamma three"])
+
+        with persistence_instance._get_connection() as conn:
+            conn.execute("VACUUM")
+
+        for title in ("beta two", "delta four"):
+            found = persistence_instance.list_conversations(search=title.split()[0])
+            assert [c["id"] for c in found] == [ids[title]]
+        assert persistence_instance.list_conversations(search="gamma") == []
+
+    def test_legacy_index_table_migrated(self, temp_db_dir):
+        """A conversation_index without seq is rebuilt with its rows kept."""
+        from app.services.persistence import PersistentConversationMemory
+
+        db_path = os.path.join(temp_db_dir, "legacy_index.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE conversations (
+                id TEXT PRIMARY KEY, created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL, metadata TEXT DEFAULT '{}'
+            );
+            CREATE TABLE conversation_index (
+                id TEXT PRIMARY KEY, title TEXT NOT NULL,
+                mode TEXT NOT NULL DEFAULT 'local', created_at TEXT NOT NULL,
+                last_used_at TEXT NOT NULL, turn_count INTEGER DEFAULT 0,
+                first_prompt TEXT
+            );
+            INSERT INTO conversations VALUES ('t1', '2025-01-01', '2025-01-01', '{}');
+            INSERT INTO conversation_index VALUES
+                ('t1', 'Legacy chat', 'local', '2025-01-01', '2025-01-02', 3, 'hello');
+        """)
+        conn.close()
+
+        memory = PersistentConversationMemory(db_path=db_path)
+        with memory._get_connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(conversation_index)")]
+        assert columns[:2] == ["seq", "id"]
+        found = memory.list_conversations(search="legacy")
+        assert [(c["id"], c["turn_count"], c["first_prompt"]) for c in found] == [("t1", 3, "hello")]
+        memory.close()
+
+
 class TestTTLExpiration:
     """TTL expiration tests."""
 
@@ -272,6 +532,26 @@ class TestTTLExpiration:
         assert new_id != thread_id
         memory.close()
 
+    def test_get_thread_does_not_delete_expired(self, temp_db_dir):
+        """Reads hide expired threads; only cleanup_expired deletes them."""
+        from app.services.persistence import PersistentConversationMemory
+
+        db_path = os.path.join(temp_db_dir, "ttl_read_test.db")
+        memory = PersistentConversationMemory(
+            db_path=db_path,
+            ttl_hours=0.0001
+        )
+
+        thread_id = memory.create_thread()
+        time.sleep(0.5)
+
+        assert memory.get_thread(thread_id) is None
+        assert memory.add_turn(thread_id, "user", "too late") is False
+        assert memory.get_stats()["threads"] == 1
+
+        assert memory.cleanup_expired() == 1
+        memory.close()
+
     def test_cleanup_removes_expired(self, temp_db_dir):
         """cleanup_expired removes old threads."""
         from app.services.persistence import PersistentConversationMemory
@@ -294,6 +574,50 @@ class TestTTLExpiration:
         assert deleted >= 5
         memory.close()
 
+    def test_cleanup_deletes_in_batches(self, temp_db_dir):
+        """cleanup_expired removes every expired thread across batches."""
+        from app.services import persistence
+
+        db_path = os.path.join(temp_db_dir, "batch_cleanup_test.db")
+        memory = persistence.PersistentConversationMemory(
+            db_path=db_path,
+            ttl_hours=0.0001
+        )
+        for _ in range(5):
+            memory.create_thread()
+
+        time.sleep(0.5)
+        with patch.object(persistence, "CLEANUP_BATCH_SIZE", 2):
+            deleted = memory.cleanup_expired()
+
+        assert deleted == 5
+        assert memory.get_stats()["threads"] == 0
+        memory.close()
+
+    def test_create_thread_purges_expired(self, temp_db_dir):
+        """create_thread runs cleanup once the cleanup interval has elapsed."""
+        from app.services.persistence import PersistentConversationMemory
+
+        db_path = os.path.join(temp_db_dir, "auto_cleanup_test.db")
+        memory = PersistentConversationMemory(
+            db_path=db_path,
+            ttl_hours=0.0001
+        )
+
+        old_id = memory.create_thread()
+        time.sleep(0.5)
+
+        # Within the interval: no cleanup yet
+        memory.create_thread()
+        assert memory.get_stats()["threads"] == 2
+
+        memory._next_cleanup = 0.0  # interval elapsed
+        memory.create_thread()
+
+        assert memory.get_thread_history(old_id) == []
+        assert memory.get_stats()["threads"] == 2
+        memory.close()
+
 
 class TestPersistenceAcrossRestarts:
     """Persistence across restarts tests."""
@@ -321,6 +645,64 @@ class TestPersistenceAcrossRestarts:
         memory2.close()
 
 
+class TestConnectionPooling:
+    """Per-thread connection reuse."""
+
+    def test_connection_reused_within_thread(self, persistence_instance):
+        """Successive calls on one thread share a connection."""
+        with persistence_instance._get_connection() as first:
+            pass
+        with persistence_instance._get_connection() as second:
+            pass
+
+        assert first is second
+
+    def test_connection_pragmas(self, persistence_instance):
+        """Pooled connections run with WAL-safe synchronous=NORMAL."""
+        with persistence_instance._get_connection() as conn:
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+            temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+
+        assert synchronous == 1  # NORMAL
+        assert temp_store == 2  # MEMORY
+
+    def test_usable_after_close(self, persistence_instance):
+        """close() releases connections; the next call reconnects."""
+        thread_id = persistence_instance.create_thread()
+        persistence_instance.close()
+
+        assert persistence_instance.get_thread(thread_id) is not None
+        assert persistence_instance.add_turn(thread_id, "user", "after close")
+
+    def test_close_leaves_other_threads_connections_to_them(self, persistence_instance):
+        """close() never closes a connection another thread is using."""
+        import threading
+
+        in_use, closed = threading.Event(), threading.Event()
+        outcome = {}
+
+        def worker():
+            with persistence_instance._get_connection() as first:
+                in_use.set()
+                closed.wait(5)
+                outcome["still_open"] = first.execute("SELECT 1").fetchone() == (1,)
+            with persistence_instance._get_connection() as second:
+                outcome["reconnected"] = second is not first
+            try:
+                first.execute("SELECT 1")
+            except sqlite3.ProgrammingError:
+                outcome["old_closed"] = True
+
+        t = threading.Thread(target=worker)
+        t.start()
+        in_use.wait(5)
+        persistence_instance.close()
+        closed.set()
+        t.join(5)
+
+        assert outcome == {"still_open": True, "reconnected": True, "old_closed": True}
+
+
 class TestThreadSafety:
     """Thread safety tests."""
 
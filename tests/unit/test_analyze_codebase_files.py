@@ -0,0 +1,128 @@
+"""
+Unit tests for analyze_codebase file collection.
+
+Tests that the scandir walker expands paths, directories and glob
+patterns exactly like glob.glob(recursive=True) / os.walk did, and
+that files are read with early size and binary checks.
+"""
+
+import glob
+import os
+
+import pytest
+
+
+@pytest.fixture
+def source_tree(tmp_path, monkeypatch):
+    """Small project tree with hidden entries, cwd set to its root."""
+    for rel in ("src/main.py", "src/pkg/util.py", "src/pkg/deep/core.py",
+                "src/pkg/deep/notes.txt", "src/.hidden/secret.py", "src/.env.py",
+                "tests/test_main.py", "README.md"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _glob_files(pattern):
+    return [f for f in glob.glob(pattern, recursive=True) if os.path.isfile(f)]
+
+
+class TestIterFiles:
+    """_iter_files() expansion."""
+
+    @pytest.mark.parametrize("pattern", [
+        "src/**/*.py", "**/*.py", "src/*.py", "*", "**", "src/**",
+        "src/.*.py", "src/*/*.py", "src/**/deep/*", "src/?ain.py",
+        "src/*/", "src/**/", "**/",
+    ])
+    def test_glob_patterns_match_glob(self, source_tree, pattern):
+        """Glob patterns yield the same files, in the same order, as glob."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        assert list(_iter_files([pattern])) == _glob_files(pattern)
+
+    def test_absolute_pattern(self, source_tree):
+        """Absolute patterns keep their absolute base directory."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        pattern = os.path.join(str(source_tree), "src", "**", "*.py")
+        assert list(_iter_files([pattern])) == _glob_files(pattern)
+
+    def test_directory_matches_os_walk(self, source_tree):
+        """Directories expand to every file below them, in os.walk order."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        expected = [
+            os.path.join(root, name)
+            for root, _, names in os.walk("src")
+            for name in names
+        ]
+        assert list(_iter_files(["src"])) == expected
+
+    def test_duplicates_and_missing_paths(self, source_tree):
+        """Files named more than once appear once; missing paths are skipped."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        files = list(_iter_files(["src/main.py", "src/*.py", "missing.py"]))
+        assert files == ["src/main.py"]
+
+    @pytest.mark.parametrize("pattern", ["src/**/*.py", "**", "src/**"])
+    def test_symlinked_directories_match_glob(self, source_tree, pattern):
+        """A symlink to a directory adds its alias paths; the real paths stay."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        os.symlink("pkg", source_tree / "src" / "cur")
+        os.symlink(os.path.join("..", "tests"), source_tree / "src" / "ext")
+
+        assert list(_iter_files([pattern])) == _glob_files(pattern)
+
+    @pytest.mark.parametrize("pattern", ["src/**/*.py", "**", "src/*/*"])
+    def test_symlink_loops_terminate(self, source_tree, pattern):
+        """Symlink cycles are walked once and broken self-links are skipped."""
+        from app.tools.code.analyze_codebase import _iter_files
+
+        expected = _glob_files(pattern)
+        os.symlink("..", source_tree / "src" / "pkg" / "loop")
+        os.symlink("self", source_tree / "src" / "self")
+
+        assert list(_iter_files([pattern])) == expected
+        assert list(_iter_files(["src"])) == [
+            os.path.join(root, name)
+            for root, _, names in os.walk("src")
+            for name in names
+        ]
+
+
+class TestLoadTextFile:
+    """_load_text_file() reads and rejections."""
+
+    def test_reads_text_like_text_mode(self, tmp_path):
+        """Content matches open(..., 'r', errors='replace').read()."""
+        from app.tools.code.analyze_codebase import _load_text_file
+
+        path = tmp_path / "crlf.py"
+        path.write_bytes(b"a = 1\r\nb = '\xff'\rc = 3\n")
+
+        with open(path, encoding="utf-8", errors="replace") as f:
+            expected = f.read()
+        assert _load_text_file(str(path), 1000) == (expected, None)
+
+    def test_rejects_binary(self, tmp_path):
+        """A NUL byte near the start marks the file as binary."""
+        from app.tools.code.analyze_codebase import _load_text_file
+
+        path = tmp_path / "blob.bin"
+        path.write_bytes(b"PK\x03\x04\x00\x00" + b"x" * 100)
+
+        assert _load_text_file(str(path), 1000) == (None, "binary file")
+
+    def test_rejects_oversize_without_reading(self, tmp_path):
+        """Files over the cap are rejected from their size alone."""
+        from app.tools.code.analyze_codebase import _load_text_file
+
+        path = tmp_path / "big.txt"
+        path.write_bytes(b"x" * 2000)
+
+        assert _load_text_file(str(path), 1000) == (None, "too large: 2,000 bytes")
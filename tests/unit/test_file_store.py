@@ -0,0 +1,58 @@
+"""
+Unit tests for File Search Store name resolution.
+
+Tests the display-name cache used by resolve_store_name().
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def file_store():
+    """file_store module with a fake client and an empty name cache."""
+    from app.tools.rag import file_store
+
+    fake_client = MagicMock()
+    fake_client.file_search_stores.list.return_value = iter([
+        SimpleNamespace(display_name="docs", name="fileSearchStores/docs-1"),
+        SimpleNamespace(display_name="docs", name="fileSearchStores/docs-2"),
+    ])
+    with patch.object(file_store, "client", fake_client):
+        file_store._store_names.clear()
+        yield file_store
+        file_store._store_names.clear()
+
+
+class TestResolveStoreName:
+    """resolve_store_name() lookups."""
+
+    def test_full_path_returned_as_is(self, file_store):
+        """Full store paths need no lookup."""
+        assert file_store.resolve_store_name("fileSearchStores/x") == "fileSearchStores/x"
+        file_store.client.file_search_stores.list.assert_not_called()
+
+    def test_display_name_listed_once(self, file_store):
+        """Repeat lookups by display name are served from the cache."""
+        assert file_store.resolve_store_name("docs") == "fileSearchStores/docs-1"
+        assert file_store.resolve_store_name("docs") == "fileSearchStores/docs-1"
+        assert file_store.client.file_search_stores.list.call_count == 1
+
+    def test_unknown_name_lists_available(self, file_store):
+        """Missing stores raise with the available display names."""
+        with pytest.raises(ValueError, match=r"Available stores: \['docs', 'docs'\]"):
+            file_store.resolve_store_name("missing")
+
+    def test_expired_entry_lists_again(self, file_store):
+        """Cached names expire so deleted or recreated stores are re-resolved."""
+        assert file_store.resolve_store_name("docs") == "fileSearchStores/docs-1"
+        file_store.client.file_search_stores.list.return_value = iter([
+            SimpleNamespace(display_name="docs", name="fileSearchStores/docs-3"),
+        ])
+
+        later = file_store.time.monotonic() + file_store._STORE_NAME_TTL + 1
+        with patch.object(file_store.time, "monotonic", return_value=later):
+            assert file_store.resolve_store_name("docs") == "fileSearchStores/docs-3"
+        assert file_store.client.file_search_stores.list.call_count == 2
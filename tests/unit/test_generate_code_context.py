@@ -0,0 +1,58 @@
+"""
+Unit tests for generate_code context file handling.
+
+Tests that each @file reference is read and sent once per request,
+including across the need_files retry.
+"""
+
+import importlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def generate_code():
+    """generate_code module with fake Gemini calls and file expansion."""
+    module = importlib.import_module("app.tools.code.generate_code")
+    if module.types is None:
+        pytest.skip("google-genai not installed")
+
+    prompts = []
+    replies = iter([
+        '{"need_files": ["a.py", "b.py"]}',
+        '<GENERATED_CODE></GENERATED_CODE>',
+    ])
+
+    def fake_generate(**kwargs):
+        prompts.append(kwargs["contents"])
+        return MagicMock(text=next(replies))
+
+    expand = MagicMock(side_effect=lambda ref: f"CONTENTS OF {ref}")
+    with patch.object(module, "generate_with_fallback", fake_generate), \
+            patch.object(module, "expand_file_references", expand):
+        yield module, prompts, expand
+
+
+class TestContextFiles:
+    """Context file expansion in generate_code()."""
+
+    def test_duplicate_context_files_read_once(self, generate_code):
+        """The same file listed twice is expanded and sent once."""
+        module, prompts, expand = generate_code
+
+        module.generate_code("task", context_files=["a.py", "@a.py"])
+
+        assert expand.call_args_list[0].args == ("@a.py",)
+        assert prompts[0].count("CONTENTS OF @a.py") == 1
+
+    def test_retry_skips_files_already_in_context(self, generate_code):
+        """need_files requests for provided files only add the missing ones."""
+        module, prompts, expand = generate_code
+
+        module.generate_code("task", context_files=["a.py"])
+
+        assert [c.args for c in expand.call_args_list] == [("@a.py",), ("@b.py",)]
+        assert len(prompts) == 2
+        assert prompts[1].count("CONTENTS OF @a.py") == 1
+        assert "CONTENTS OF @b.py" in prompts[1]
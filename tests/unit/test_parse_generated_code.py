@@ -139,3 +139,32 @@ content
 
         # Implementation may vary - check it doesn't crash
         assert isinstance(files, list)
+
+
+class TestRegexFallback:
+    """Tests for the malformed-XML fallback parser."""
+
+    def test_malformed_xml_uses_fallback(self):
+        """Valid FILE blocks are recovered from output that isn't well-formed."""
+        from app.tools.code.generate_code import parse_generated_code
+
+        xml = '''<GENERATED_CODE>
+<FILE action="create" path="a.py">
+if a < b and c & d: pass
+</FILE>
+<FILE action="explode" path="b.py">x</FILE>
+</GENERATED_CODE>'''
+
+        files = parse_generated_code(xml)
+
+        assert files == [{"action": "create", "path": "a.py", "content": "if a < b and c & d: pass"}]
+
+    @pytest.mark.parametrize("path", ["/etc/passwd", "~/.bashrc", "src/../../x.py", "  "])
+    def test_unsafe_paths_rejected_by_both_parsers(self, path):
+        """Absolute, home-relative, traversing and blank paths are dropped."""
+        from app.tools.code.generate_code import _parse_with_regex_fallback, parse_generated_code
+
+        block = f'<FILE action="create" path="{path}">x</FILE>'
+
+        assert parse_generated_code(f"<GENERATED_CODE>{block}</GENERATED_CODE>") == []
+        assert _parse_with_regex_fallback(block) == []
@@ -0,0 +1,118 @@
+"""
+Unit tests for the Gemini response cache.
+
+Tests LRU/TTL behaviour and which requests are cacheable.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class TestResponseCache:
+    """ResponseCache LRU and TTL behaviour."""
+
+    def test_hit_after_put(self):
+        """A stored value is returned and counted as a hit."""
+        from app.services.gemini import ResponseCache
+
+        cache = ResponseCache(maxsize=2, ttl_seconds=60)
+        assert cache.get(b"k") is None
+        cache.put(b"k", "v")
+
+        assert cache.get(b"k") == "v"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """The oldest untouched entry is evicted when full."""
+        from app.services.gemini import ResponseCache
+
+        cache = ResponseCache(maxsize=2, ttl_seconds=60)
+        cache.put(b"a", 1)
+        cache.put(b"b", 2)
+        cache.get(b"a")
+        cache.put(b"c", 3)
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entry_is_a_miss(self):
+        """Entries past their TTL are dropped."""
+        from app.services.gemini import ResponseCache
+
+        cache = ResponseCache(maxsize=2, ttl_seconds=0)
+        cache.put(b"k", "v")
+
+        assert cache.get(b"k") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestGenerateWithFallbackCache:
+    """generate_with_fallback only caches deterministic text requests."""
+
+    @pytest.fixture
+    def gemini(self):
+        from app.services import gemini
+
+        if gemini.types is None:
+            pytest.skip("google-genai not installed")
+        fake_client = MagicMock()
+        fake_client.models.generate_content.side_effect = lambda **kw: object()
+        with patch.object(gemini, "_available", True), \
+                patch.object(gemini, "client", fake_client):
+            gemini._response_cache.clear()
+            yield gemini
+            gemini._response_cache.clear()
+
+    def test_repeat_at_temperature_zero_is_cached(self, gemini):
+        """Identical temperature-0 requests hit the API once."""
+        config = gemini.types.GenerateContentConfig(temperature=0)
+
+        first = gemini.generate_with_fallback("m", "hello", config)
+        second = gemini.generate_with_fallback(
+            "m", "hello", gemini.types.GenerateContentConfig(temperature=0)
+        )
+
+        assert first is second
+        assert gemini.client.models.generate_content.call_count == 1
+
+    def test_sampling_requests_are_not_cached(self, gemini):
+        """Requests with temperature > 0 always reach the API."""
+        config = gemini.types.GenerateContentConfig(temperature=0.5)
+
+        gemini.generate_with_fallback("m", "hello", config)
+        gemini.generate_with_fallback("m", "hello", config)
+
+        assert gemini.client.models.generate_content.call_count == 2
+
+    def test_tool_requests_are_not_cached(self, gemini):
+        """Grounded requests (search, file search) are never cached."""
+        config = gemini.types.GenerateContentConfig(
+            temperature=0,
+            tools=[gemini.types.Tool(google_search=gemini.types.GoogleSearch())],
+        )
+
+        gemini.generate_with_fallback("m", "hello", config)
+        gemini.generate_with_fallback("m", "hello", config)
+
+        assert gemini.client.models.generate_content.call_count == 2
+
+    def test_flash_fallback_is_not_cached(self, gemini):
+        """A Flash answer to a Pro request is not reused once Pro recovers."""
+        calls = []
+
+        def generate(model, **kw):
+            calls.append(model)
+            if model == "gemini-pro-x" and len(calls) == 1:
+                raise Exception("429 RESOURCE_EXHAUSTED: quota exceeded")
+            return object()
+
+        gemini.client.models.generate_content.side_effect = generate
+        config = gemini.types.GenerateContentConfig(temperature=0)
+
+        gemini.generate_with_fallback("gemini-pro-x", "hello", config)
+        gemini.generate_with_fallback("gemini-pro-x", "hello", config)
+
+        assert calls == ["gemini-pro-x", gemini.MODELS["flash"], "gemini-pro-x"]
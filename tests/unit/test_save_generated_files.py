@@ -0,0 +1,66 @@
+"""
+Unit tests for save_generated_files function.
+
+Tests writing parsed <FILE> blocks to disk.
+"""
+
+import os
+
+
+class TestSaveGeneratedFiles:
+    """Tests for save_generated_files function."""
+
+    def test_writes_content_and_counts_lines(self, temp_sandbox):
+        """Files are written as UTF-8 and the result reports line counts."""
+        from app.tools.code.generate_code import save_generated_files
+
+        files = [{"action": "create", "path": "hello.py", "content": "print('héllo')\nx = 1"}]
+        results = save_generated_files(files, temp_sandbox)
+
+        assert results[0]["status"] == "success"
+        assert results[0]["lines"] == 2
+        with open(os.path.join(temp_sandbox, "hello.py"), encoding="utf-8") as f:
+            assert f.read() == "print('héllo')\nx = 1"
+
+    def test_overwrite_truncates_existing_file(self, temp_sandbox):
+        """A shorter file replaces the old contents entirely."""
+        from app.tools.code.generate_code import save_generated_files
+
+        path = os.path.join(temp_sandbox, "a.txt")
+        with open(path, "w") as f:
+            f.write("old contents that are longer")
+
+        save_generated_files([{"action": "modify", "path": "a.txt", "content": "new"}], temp_sandbox)
+
+        with open(path) as f:
+            assert f.read() == "new"
+
+    def test_write_error_reported_per_file(self, temp_sandbox):
+        """A file that cannot be written is reported; the others are still saved."""
+        from app.tools.code.generate_code import save_generated_files
+
+        os.mkdir(os.path.join(temp_sandbox, "taken"))
+        files = [
+            {"action": "create", "path": "taken", "content": "x"},
+            {"action": "create", "path": "ok.txt", "content": "y"},
+        ]
+        results = save_generated_files(files, temp_sandbox)
+
+        assert [r["status"] for r in results] == ["error", "success"]
+
+    def test_creates_each_directory_once(self, temp_sandbox):
+        """Nested directories are created with one makedirs per distinct directory."""
+        import importlib
+        from unittest.mock import patch
+
+        generate_code = importlib.import_module("app.tools.code.generate_code")
+        files = [{"action": "create", "path": "pkg/__init__.py", "content": ""}] + [
+            {"action": "create", "path": f"pkg/sub/m{i}.py", "content": ""} for i in range(3)
+        ]
+
+        with patch("os.makedirs", wraps=os.makedirs) as makedirs:
+            results = generate_code.save_generated_files(files, temp_sandbox)
+
+        assert all(r["status"] == "success" for r in results)
+        assert makedirs.call_count == 2
+        assert os.path.isfile(os.path.join(temp_sandbox, "pkg", "sub", "m2.py"))
@@ -0,0 +1,104 @@
+"""
+Unit tests for StructuredLogger JSON output.
+
+Tests record shape, None-field omission and secrets sanitization.
+"""
+
+import json
+import re
+
+
+def _last_record(capsys):
+    err = capsys.readouterr().err.strip().splitlines()
+    return json.loads(err[-1])
+
+
+class TestStructuredLoggerOutput:
+    """JSON records written to stderr."""
+
+    def test_tool_success_record(self, capsys):
+        """Success records carry duration, request id and result length."""
+        from app.core.logging import StructuredLogger
+
+        StructuredLogger().tool_success("ask_gemini", "req1", 12.345, 42)
+        record = _last_record(capsys)
+
+        assert list(record) == [
+            "timestamp", "level", "tool", "status",
+            "duration_ms", "request_id", "details",
+        ]
+        assert record["level"] == "INFO"
+        assert record["status"] == "success"
+        assert record["duration_ms"] == 12.35
+        assert record["details"] == {"result_length": "42"}
+        assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z", record["timestamp"])
+
+    def test_info_omits_none_fields(self, capsys):
+        """Fields that are None are left out of the record."""
+        from app.core.logging import StructuredLogger
+
+        StructuredLogger().info("hello")
+        record = _last_record(capsys)
+
+        assert "tool" not in record
+        assert "duration_ms" not in record
+        assert "request_id" not in record
+        assert "error" not in record
+        assert record["details"] == {"message": "hello"}
+
+    def test_error_is_sanitized(self, capsys):
+        """Secrets in error messages are masked."""
+        from app.core.logging import StructuredLogger
+
+        key = "AIza" + "x" * 35
+        StructuredLogger().tool_error("ask_gemini", "req1", 1.0, f"bad key {key}")
+        record = _last_record(capsys)
+
+        assert record["level"] == "ERROR"
+        assert key not in record["error"]
+
+    def test_sanitize_cache_keeps_no_raw_secrets(self, capsys):
+        """The sanitization cache holds only redacted output, not the raw value."""
+        from app.core import logging as structured
+
+        key = "AIza" + "y" * 35
+        structured.StructuredLogger().tool_error("ask_gemini", "req1", 1.0, f"bad key {key}")
+
+        assert not any(key in value for value in structured._sanitize_cache.values())
+        assert not any(isinstance(k, str) for k in structured._sanitize_cache)
+
+
+class TestActivityLogText:
+    """Text-mode activity log lines."""
+
+    def test_details_written_as_json(self):
+        """Details stay one JSON field even when values contain delimiters."""
+        from unittest.mock import MagicMock, patch
+
+        from app.core import logging as app_logging
+
+        activity = MagicMock()
+        with patch.object(app_logging.config, "log_format", "text"), \
+                patch.object(app_logging, "activity_logger", activity):
+            app_logging.log_activity(
+                "ask_gemini", "start", details={"prompt": "a = b | c", "n": 2}
+            )
+
+        line = activity.info.call_args.args[0]
+        details = line.split(" | ", 2)[2]
+        assert details.startswith("details=")
+        assert json.loads(details[len("details="):]) == {"prompt": "a = b | c", "n": 2}
+
+
+class TestJsonDumps:
+    """Log record serialization."""
+
+    def test_stdlib_fallback_keeps_original_format(self):
+        """Without orjson, records match plain json.dumps output."""
+        from unittest.mock import patch
+
+        from app.core import logging as structured
+
+        record = {"message": "héllo", "n": 1}
+        with patch.object(structured, "HAS_ORJSON", False):
+            assert structured._json_dumps(record) == '{"message": "h\\u00e9llo", "n": 1}'
@@ -0,0 +1,143 @@
+"""
+Unit tests for ToolRegistry.
+
+Tests registration, the cached tools list, its invalidation and deferred loading.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+def _noop(text: str) -> str:
+    """Echo the input."""
+    return text
+
+
+class TestToolsListCache:
+    """Cached list_tools() output."""
+
+    def test_list_reflects_registered_tools(self):
+        """list_tools returns MCP definitions for registered tools."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        registry.register("echo", _noop)
+
+        tools = registry.list_tools()
+        assert [t["name"] for t in tools] == ["echo"]
+        assert tools[0]["description"] == "Echo the input."
+        assert tools[0]["inputSchema"]["required"] == ["text"]
+
+    def test_register_invalidates_cache(self):
+        """Registering a tool after listing shows up in the next list."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        registry.register("echo", _noop)
+        registry.list_tools()
+        registry.register("echo2", _noop)
+
+        assert [t["name"] for t in registry.list_tools()] == ["echo", "echo2"]
+
+    def test_disable_invalidates_cache(self):
+        """Disabled tools disappear from the next list."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        registry.register("echo", _noop)
+        registry.register("echo2", _noop)
+        registry.list_tools()
+        registry.disable(["echo"])
+
+        assert [t["name"] for t in registry.get_tools_list()] == ["echo2"]
+
+    def test_caller_mutation_does_not_leak(self):
+        """Mutating the returned list does not affect the cache."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        registry.register("echo", _noop)
+        registry.list_tools().clear()
+
+        assert len(registry.list_tools()) == 1
+
+
+class TestDeferredLoading:
+    """Tool modules loaded on first registry query."""
+
+    def test_loader_runs_once_on_first_query(self):
+        """The loader registers tools lazily, exactly once."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            registry.register("echo", _noop)
+
+        registry.set_loader(loader)
+        assert calls == []
+
+        assert "echo" in registry
+        assert registry.execute("echo", {"text": "hi"}) == "hi"
+        assert len(registry.list_tools()) == 1
+        assert calls == [1]
+
+    def test_disabled_before_load_stays_disabled(self):
+        """Tools disabled before loading are not registered by the loader."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        registry.set_loader(lambda: registry.register("echo", _noop))
+        registry.disable(["echo"])
+
+        assert registry.get("echo") is None
+
+    def test_failed_loader_is_retried(self):
+        """A loader that raises runs again on the next query."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        attempts = []
+
+        def loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ImportError("transient")
+            registry.register("echo", _noop)
+
+        registry.set_loader(loader)
+        with pytest.raises(ImportError):
+            registry.get("echo")
+
+        assert registry.get("echo") is not None
+        assert len(attempts) == 2
+
+    def test_concurrent_queries_wait_for_load(self):
+        """Threads querying during the load see the loaded tools."""
+        from app.tools.registry import ToolRegistry
+
+        registry = ToolRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            registry.register("echo", _noop)
+
+        registry.set_loader(loader)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get("echo")))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == [1]
+        assert all(r is not None for r in results)